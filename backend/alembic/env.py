@@ -4,7 +4,8 @@ from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
-from app.db.models.user import Base
+from app.db.models.base import Base
+from app.db.models import user, transaction  # noqa: F401 (register tables)
 from app.core.config import settings
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,59 @@
+"""create transactions table
+
+Revision ID: 3b7c1f9a2d4e
+Revises: fdabc88306e8
+Create Date: 2026-10-18 10:12:41.508113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c1f9a2d4e'
+down_revision: Union[str, None] = 'fdabc88306e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transactions',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('link_id', sa.String(), nullable=False),
+    sa.Column('account_id', sa.String(), nullable=False),
+    sa.Column('value_date', sa.Date(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('category', sa.String(), nullable=True),
+    sa.Column('subcategory', sa.String(), nullable=True),
+    sa.Column('collected_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_transactions_account_id_value_date', 'transactions', ['account_id', 'value_date'], unique=False)
+    op.create_index(op.f('ix_transactions_link_id'), 'transactions', ['link_id'], unique=False)
+    op.create_table('transaction_sync_cursors',
+    sa.Column('account_id', sa.String(), nullable=False),
+    sa.Column('link_id', sa.String(), nullable=False),
+    sa.Column('last_collected_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('synced_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('account_id')
+    )
+    op.create_index(op.f('ix_transaction_sync_cursors_link_id'), 'transaction_sync_cursors', ['link_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_transaction_sync_cursors_link_id'), table_name='transaction_sync_cursors')
+    op.drop_table('transaction_sync_cursors')
+    op.drop_index(op.f('ix_transactions_link_id'), table_name='transactions')
+    op.drop_index('ix_transactions_account_id_value_date', table_name='transactions')
+    op.drop_table('transactions')
@@ -0,0 +1,107 @@
+"""store amounts in minor units
+
+Revision ID: 5a0f3c2e7b81
+Revises: c41d8e6f2a93
+Create Date: 2026-10-18 13:40:52.116078
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a0f3c2e7b81'
+down_revision: Union[str, None] = 'c41d8e6f2a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Minor unit scale per currency, as in app.core.money
+SCALE = """
+    CASE {currency}
+        WHEN 'CLP' THEN 1 WHEN 'JPY' THEN 1 WHEN 'KRW' THEN 1 WHEN 'PYG' THEN 1 WHEN 'UYI' THEN 1
+        WHEN 'BHD' THEN 1000 WHEN 'KWD' THEN 1000
+        ELSE 100
+    END
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transactions', sa.Column('amount_minor', sa.BigInteger(), nullable=True))
+    op.execute(f"UPDATE transactions SET amount_minor = round(amount * {SCALE.format(currency='currency')})")
+    op.alter_column('transactions', 'amount_minor', nullable=False)
+    op.drop_column('transactions', 'amount')
+
+    # Rebuild the KPI aggregates in minor units
+    op.execute("TRUNCATE transaction_daily_rollups, account_kpis")
+    op.drop_column('transaction_daily_rollups', 'income')
+    op.drop_column('transaction_daily_rollups', 'expenses')
+    op.add_column('transaction_daily_rollups', sa.Column('currency', sa.String(length=3), nullable=False))
+    op.add_column('transaction_daily_rollups', sa.Column('income_minor', sa.BigInteger(), nullable=False))
+    op.add_column('transaction_daily_rollups', sa.Column('expenses_minor', sa.BigInteger(), nullable=False))
+    op.drop_column('account_kpis', 'total_income')
+    op.drop_column('account_kpis', 'total_expenses')
+    op.add_column('account_kpis', sa.Column('currency', sa.String(length=3), nullable=True))
+    op.add_column('account_kpis', sa.Column('total_income_minor', sa.BigInteger(), nullable=False))
+    op.add_column('account_kpis', sa.Column('total_expenses_minor', sa.BigInteger(), nullable=False))
+    op.execute("""
+        INSERT INTO transaction_daily_rollups
+            (account_id, day, currency, income_minor, expenses_minor, transaction_count)
+        SELECT
+            account_id,
+            value_date,
+            max(currency),
+            coalesce(sum(amount_minor) FILTER (WHERE type = 'INFLOW'), 0),
+            coalesce(sum(amount_minor) FILTER (WHERE type <> 'INFLOW'), 0),
+            count(*)
+        FROM transactions
+        GROUP BY account_id, value_date
+    """)
+    op.execute("""
+        INSERT INTO account_kpis
+            (account_id, currency, total_income_minor, total_expenses_minor, transaction_count, updated_at)
+        SELECT account_id, max(currency), sum(income_minor), sum(expenses_minor), sum(transaction_count),
+            now() AT TIME ZONE 'utc'
+        FROM transaction_daily_rollups
+        GROUP BY account_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('transactions', sa.Column('amount', sa.Numeric(precision=18, scale=2), nullable=True))
+    op.execute(f"UPDATE transactions SET amount = amount_minor::numeric / {SCALE.format(currency='currency')}")
+    op.alter_column('transactions', 'amount', nullable=False)
+    op.drop_column('transactions', 'amount_minor')
+
+    op.execute("TRUNCATE transaction_daily_rollups, account_kpis")
+    op.drop_column('account_kpis', 'total_expenses_minor')
+    op.drop_column('account_kpis', 'total_income_minor')
+    op.drop_column('account_kpis', 'currency')
+    op.add_column('account_kpis', sa.Column('total_income', sa.Numeric(precision=18, scale=2), nullable=False))
+    op.add_column('account_kpis', sa.Column('total_expenses', sa.Numeric(precision=18, scale=2), nullable=False))
+    op.drop_column('transaction_daily_rollups', 'expenses_minor')
+    op.drop_column('transaction_daily_rollups', 'income_minor')
+    op.drop_column('transaction_daily_rollups', 'currency')
+    op.add_column('transaction_daily_rollups', sa.Column('income', sa.Numeric(precision=18, scale=2), nullable=False))
+    op.add_column('transaction_daily_rollups', sa.Column('expenses', sa.Numeric(precision=18, scale=2), nullable=False))
+    op.execute("""
+        INSERT INTO transaction_daily_rollups (account_id, day, income, expenses, transaction_count)
+        SELECT
+            account_id,
+            value_date,
+            coalesce(sum(amount) FILTER (WHERE type = 'INFLOW'), 0),
+            coalesce(sum(amount) FILTER (WHERE type <> 'INFLOW'), 0),
+            count(*)
+        FROM transactions
+        GROUP BY account_id, value_date
+    """)
+    op.execute("""
+        INSERT INTO account_kpis (account_id, total_income, total_expenses, transaction_count, updated_at)
+        SELECT account_id, sum(income), sum(expenses), sum(transaction_count), now() AT TIME ZONE 'utc'
+        FROM transaction_daily_rollups
+        GROUP BY account_id
+    """)
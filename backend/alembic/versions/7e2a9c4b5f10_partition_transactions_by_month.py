@@ -0,0 +1,93 @@
+"""partition transactions by month
+
+Revision ID: 7e2a9c4b5f10
+Revises: 3b7c1f9a2d4e
+Create Date: 2026-10-18 11:03:17.224519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2a9c4b5f10'
+down_revision: Union[str, None] = '3b7c1f9a2d4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = (
+    "id, link_id, account_id, value_date, amount, currency, type, status, "
+    "category, subcategory, collected_at, data, created_at, updated_at"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE transactions RENAME TO transactions_unpartitioned")
+    op.execute("ALTER TABLE transactions_unpartitioned RENAME CONSTRAINT transactions_pkey TO transactions_unpartitioned_pkey")
+    op.drop_index('ix_transactions_account_id_value_date', table_name='transactions_unpartitioned')
+    op.drop_index('ix_transactions_link_id', table_name='transactions_unpartitioned')
+
+    op.execute("""
+        CREATE TABLE transactions (
+            id VARCHAR NOT NULL,
+            link_id VARCHAR NOT NULL,
+            account_id VARCHAR NOT NULL,
+            value_date DATE NOT NULL,
+            amount NUMERIC(18, 2) NOT NULL,
+            currency VARCHAR(3) NOT NULL,
+            type VARCHAR NOT NULL,
+            status VARCHAR,
+            category VARCHAR,
+            subcategory VARCHAR,
+            collected_at TIMESTAMP WITH TIME ZONE,
+            data JSONB NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT transactions_pkey PRIMARY KEY (id, value_date)
+        ) PARTITION BY RANGE (value_date)
+    """)
+    op.create_index('ix_transactions_account_id_value_date', 'transactions', ['account_id', 'value_date'], unique=False)
+    op.create_index('ix_transactions_link_id', 'transactions', ['link_id'], unique=False)
+    op.create_index('ix_transactions_value_date_brin', 'transactions', ['value_date'], unique=False, postgresql_using='brin')
+
+    # One partition per month already holding data
+    op.execute("""
+        DO $$
+        DECLARE month date;
+        BEGIN
+            FOR month IN SELECT DISTINCT date_trunc('month', value_date)::date FROM transactions_unpartitioned LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF transactions FOR VALUES FROM (%L) TO (%L)',
+                    to_char(month, '"transactions_y"YYYY"m"MM'), month, (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_unpartitioned")
+    op.execute("DROP TABLE transactions_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE transactions RENAME TO transactions_partitioned")
+    op.execute("ALTER TABLE transactions_partitioned RENAME CONSTRAINT transactions_pkey TO transactions_partitioned_pkey")
+    op.drop_index('ix_transactions_value_date_brin', table_name='transactions_partitioned')
+    op.drop_index('ix_transactions_link_id', table_name='transactions_partitioned')
+    op.drop_index('ix_transactions_account_id_value_date', table_name='transactions_partitioned')
+
+    op.execute(f"CREATE TABLE transactions AS SELECT {COLUMNS} FROM transactions_partitioned")
+    op.execute("ALTER TABLE transactions ALTER COLUMN id SET NOT NULL")
+    op.execute("ALTER TABLE transactions ALTER COLUMN link_id SET NOT NULL")
+    op.execute("ALTER TABLE transactions ALTER COLUMN account_id SET NOT NULL")
+    op.execute("ALTER TABLE transactions ALTER COLUMN value_date SET NOT NULL")
+    op.execute("ALTER TABLE transactions ALTER COLUMN amount SET NOT NULL")
+    op.execute("ALTER TABLE transactions ALTER COLUMN currency SET NOT NULL")
+    op.execute("ALTER TABLE transactions ALTER COLUMN type SET NOT NULL")
+    op.execute("ALTER TABLE transactions ALTER COLUMN data SET NOT NULL")
+    op.create_primary_key('transactions_pkey', 'transactions', ['id'])
+    op.create_index('ix_transactions_account_id_value_date', 'transactions', ['account_id', 'value_date'], unique=False)
+    op.create_index('ix_transactions_link_id', 'transactions', ['link_id'], unique=False)
+    op.execute("DROP TABLE transactions_partitioned")
@@ -0,0 +1,63 @@
+"""create kpi rollups
+
+Revision ID: c41d8e6f2a93
+Revises: 7e2a9c4b5f10
+Create Date: 2026-10-18 12:21:05.837214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8e6f2a93'
+down_revision: Union[str, None] = '7e2a9c4b5f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transaction_daily_rollups',
+    sa.Column('account_id', sa.String(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('income', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('expenses', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('account_id', 'day')
+    )
+    op.create_table('account_kpis',
+    sa.Column('account_id', sa.String(), nullable=False),
+    sa.Column('total_income', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('total_expenses', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('account_id')
+    )
+
+    # Backfill from the transactions already stored
+    op.execute("""
+        INSERT INTO transaction_daily_rollups (account_id, day, income, expenses, transaction_count)
+        SELECT
+            account_id,
+            value_date,
+            coalesce(sum(amount) FILTER (WHERE type = 'INFLOW'), 0),
+            coalesce(sum(amount) FILTER (WHERE type <> 'INFLOW'), 0),
+            count(*)
+        FROM transactions
+        GROUP BY account_id, value_date
+    """)
+    op.execute("""
+        INSERT INTO account_kpis (account_id, total_income, total_expenses, transaction_count, updated_at)
+        SELECT account_id, sum(income), sum(expenses), sum(transaction_count), now() AT TIME ZONE 'utc'
+        FROM transaction_daily_rollups
+        GROUP BY account_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('account_kpis')
+    op.drop_table('transaction_daily_rollups')
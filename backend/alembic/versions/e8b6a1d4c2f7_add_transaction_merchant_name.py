@@ -0,0 +1,29 @@
+"""add transaction merchant name
+
+Revision ID: e8b6a1d4c2f7
+Revises: 5a0f3c2e7b81
+Create Date: 2026-10-18 14:52:30.671942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b6a1d4c2f7'
+down_revision: Union[str, None] = '5a0f3c2e7b81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transactions', sa.Column('merchant_name', sa.String(), nullable=True))
+    op.execute("UPDATE transactions SET merchant_name = data -> 'merchant' ->> 'merchant_name'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('transactions', 'merchant_name')
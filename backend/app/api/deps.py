@@ -1,41 +1,41 @@
 from typing import Annotated
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
-from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.core.security import verify_password
-from app.db.deps import get_db
+from app.core.principals import cache_principal, get_cached_principal
+from app.core.security import verify_token
 from app.db.repositories.users import UserRepository
-from app.schemas.token import TokenPayload
+from app.db.session import AsyncSessionLocal
+from app.schemas.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
-    db: AsyncSession = Depends(get_db)
-):
-    """Get current authenticated user"""
+    request: Request,
+    token: Annotated[str, Depends(oauth2_scheme)]
+) -> User:
+    """Get current authenticated user (the cached principal, Postgres only on a miss)"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(
-            token, 
-            settings.JWT_SECRET_KEY, 
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-        if token_data.sub is None:
-            raise credentials_exception
-    except JWTError:
+    # AuthMiddleware already verified the token, reuse its claims
+    payload = getattr(request.state, "token_claims", None) or verify_token(token)
+    if payload is None or payload.get("sub") is None:
         raise credentials_exception
+    user_id = int(payload["sub"])
     
-    repo = UserRepository(db)
-    user = await repo.get_by_id(int(token_data.sub))
+    user = await get_cached_principal(user_id)
     if user is None:
-        raise credentials_exception
-    return user 
\ No newline at end of file
+        async with AsyncSessionLocal() as session:
+            db_user = await UserRepository(session).get_by_id(user_id)
+        if db_user is None:
+            raise credentials_exception
+        user = User.model_validate(db_user)
+        await cache_principal(user)
+    
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
+    return user
@@ -1,55 +1,68 @@
-from fastapi import Request, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import jwt, JWTError
+from fastapi import HTTPException, status
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.core.config import settings
-from starlette.middleware.base import BaseHTTPMiddleware
 from app.services.token_service import TokenService
-from app.core.security import verify_token
+from app.core.security import token_id, verify_token
 
-security = HTTPBearer()
 token_service = TokenService()
 
-class AuthMiddleware(BaseHTTPMiddleware):
+# routes that don't need authentication
+PUBLIC_PATHS = frozenset([
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    f"{settings.API_V1_STR}/openapi.json",
+    f"{settings.API_V1_STR}/auth/login",
+    f"{settings.API_V1_STR}/auth/register",
+    f"{settings.API_V1_STR}/auth/refresh",
+    f"{settings.API_V1_STR}/auth/logout",
+    "/"
+])
+
+def get_bearer_token(scope: Scope) -> str:
+    """Extract the bearer token from the Authorization header"""
+    authorization = Headers(scope=scope).get("authorization")
+    scheme, _, credentials = (authorization or "").partition(" ")
+    if not authorization or scheme.lower() != "bearer" or not credentials:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authenticated",
+        )
+    return credentials
+
+class AuthMiddleware:
     """Authentication middleware"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # routes that don't need authentication
-        public_paths = [
-            "/docs",
-            "/redoc",
-            "/openapi.json",
-            f"{settings.API_V1_STR}/openapi.json",
-            f"{settings.API_V1_STR}/auth/login",
-            f"{settings.API_V1_STR}/auth/register",
-            f"{settings.API_V1_STR}/auth/refresh",
-            f"{settings.API_V1_STR}/auth/logout",
-            "/"
-        ]
-        
-        if request.url.path in public_paths:
-            return await call_next(request)
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in PUBLIC_PATHS:
+            await self.app(scope, receive, send)
+            return
 
         try:
-            credentials = await security(request)
-            token = credentials.credentials
-            
-            is_blacklisted = await token_service.is_token_blacklisted(token)
-            
-            if is_blacklisted:
+            token = get_bearer_token(scope)
+
+            payload = verify_token(token, token_type="access")
+            if not payload:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token has been revoked",
+                    detail="Invalid token or wrong token type",
                     headers={"WWW-Authenticate": "Bearer"},
                 )
-            
-            payload = verify_token(token, token_type="access")
-            if not payload:
+
+            # Revocations are keyed by jti, which only a verified token can tell
+            is_blacklisted = await token_service.is_token_blacklisted(token_id(token, payload))
+
+            if is_blacklisted:
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token or wrong token type",
+                    detail="Token has been revoked",
                     headers={"WWW-Authenticate": "Bearer"},
                 )
-                
+
         except HTTPException as e:
             raise e
         except Exception:
@@ -59,4 +72,9 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return await call_next(request) 
\ No newline at end of file
+        # Expose the verified claims to inner layers (dependencies, per-user cache keys)
+        state = scope.setdefault("state", {})
+        state["token_claims"] = payload
+        state["user_id"] = payload.get("sub")
+
+        await self.app(scope, receive, send)
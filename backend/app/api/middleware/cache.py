@@ -1,72 +1,218 @@
-from fastapi import Request
-from redis import asyncio as aioredis
+from urllib.parse import parse_qsl, urlencode
+from app.core import codec
+from app.core.cache import TwoTierCache, get_cache
 from app.core.config import settings
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response, JSONResponse, StreamingResponse
-import json
+from app.core.principals import get_principal_version
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import hashlib
+import struct
 
-class CacheMiddleware(BaseHTTPMiddleware):
+SKIP_CACHE_PATHS = (
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    f"{settings.API_V1_STR}/auth",
+    f"{settings.API_V1_STR}/metrics",
+)
+
+# Streamed variants are negotiated through Accept, which the key does not
+# include: such requests bypass the cache instead of getting the JSON body
+UNCACHED_MEDIA_TYPES = ("application/x-ndjson",)
+
+# Cached responses are per user, so shared caches must not store them and
+# browsers must revalidate (If-None-Match) before reusing them
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(body: bytes) -> bytes:
+    """Strong ETag for a response body"""
+    return b'"' + hashlib.blake2b(body, digest_size=16).hexdigest().encode() + b'"'
+
+def etag_matches(if_none_match: str | None, etag: bytes) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = etag.decode("latin-1")
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+def make_cache_key(scope: Scope, version: int = 0) -> str:
+    """Cache key from principal and its version, path and normalized query string"""
+    principal = scope.get("state", {}).get("user_id") or "anonymous"
+    query = parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    key = f"cache:{principal}:v{version}:{scope['path']}"
+    if query:
+        key = f"{key}?{urlencode(sorted(query))}"
+    return key
+
+# Cache entry: etag length, header block length, etag, header block, body
+ENTRY_PREFIX = struct.Struct(">HI")
+RawHeaders = list[tuple[bytes, bytes]]
+
+def pack_entry(etag: bytes, headers: RawHeaders, body: bytes) -> bytes:
+    """Serialize a response so a hit can be replayed byte for byte"""
+    header_block = b"\r\n".join(name + b": " + value for name, value in headers)
+    return ENTRY_PREFIX.pack(len(etag), len(header_block)) + etag + header_block + body
+
+def unpack_entry(entry: bytes) -> tuple[bytes, RawHeaders, bytes] | None:
+    """Inverse of `pack_entry`, None for entries in an unknown layout"""
+    if len(entry) < ENTRY_PREFIX.size:
+        return None
+    etag_length, header_length = ENTRY_PREFIX.unpack_from(entry)
+    start = ENTRY_PREFIX.size
+    body_start = start + etag_length + header_length
+    if body_start > len(entry):
+        return None
+    etag = entry[start:start + etag_length]
+    header_block = entry[start + etag_length:body_start]
+    headers = [
+        tuple(line.split(b": ", 1))
+        for line in header_block.split(b"\r\n")
+    ] if header_block else []
+    return etag, headers, entry[body_start:]
+
+def cache_headers(raw_headers: RawHeaders, etag: bytes) -> RawHeaders:
+    """Headers stored with an entry: the app's own, without framing, plus validators"""
+    headers = [
+        (name, value) for name, value in raw_headers
+        if name not in (b"content-length", b"transfer-encoding", b"etag")
+    ]
+    headers.append((b"etag", etag))
+    if not any(name == b"cache-control" for name, _ in headers):
+        headers.append((b"cache-control", CACHE_CONTROL.encode()))
+    return headers
+
+async def send_not_modified(send: Send, etag: bytes):
+    await send({
+        "type": "http.response.start",
+        "status": 304,
+        "headers": [(b"etag", etag), (b"cache-control", CACHE_CONTROL.encode())],
+    })
+    await send({"type": "http.response.body", "body": b""})
+
+class CacheMiddleware:
     """Cache middleware for GET requests"""
-    
-    def __init__(self, app):
-        super().__init__(app)
-        self.redis = None
-
-    async def init_redis(self):
-        """Initialize Redis connection"""
-        try:
-            if not self.redis:
-                self.redis = await aioredis.from_url(
-                    f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-                    password=settings.REDIS_PASSWORD or None,
-                    encoding="utf-8",
-                    decode_responses=True
-                )
-                await self.redis.ping()
-        except Exception:
-            self.redis = None
-
-    async def get_cache(self, key: str) -> str | None:
+
+    def __init__(self, app: ASGIApp, cache: TwoTierCache | None = None):
+        self.app = app
+        self._cache = cache
+
+    @property
+    def cache(self) -> TwoTierCache:
+        return self._cache or get_cache()
+
+    async def get_cache(self, key: str) -> bytes | None:
         """Get value from cache"""
-        await self.init_redis()
-        return await self.redis.get(key)
+        cached = await self.cache.get(key)
+        return codec.unpack_bytes(cached) if cached else None
 
-    async def set_cache(self, key: str, value: str, expire: int = 300):
+    async def set_cache(self, key: str, value: bytes, expire: int = settings.CACHE_TTL):
         """Set value in cache"""
-        await self.init_redis()
-        await self.redis.set(key, value, ex=expire)
-
-    async def dispatch(self, request: Request, call_next):
-        if request.method != "GET":
-            return await call_next(request)
-
-        skip_cache_paths = ["/docs", "/redoc", "/openapi.json", f"{settings.API_V1_STR}/auth"]
-        if any(request.url.path.startswith(path) for path in skip_cache_paths):
-            return await call_next(request)
-
-        cache_key = f"cache:{request.url.path}"
-        cached_response = await self.get_cache(cache_key)
-        
-        if cached_response:
-            return JSONResponse(content=json.loads(cached_response))
-        
-        response = await call_next(request)
-        
-        if response.status_code == 200:
-            try:
-                response_body = b""
-                async for chunk in response.body_iterator:
-                    response_body += chunk
-                
-                content = json.loads(response_body.decode())
-                await self.set_cache(cache_key, json.dumps(content))
-                return JSONResponse(content=content)
-                
-            except Exception:
-                return Response(
-                    content=response_body,
-                    status_code=response.status_code,
-                    headers=dict(response.headers)
-                )
-        
-        return response 
\ No newline at end of file
+        await self.cache.set(key, codec.pack_bytes(value), expire)
+
+    @staticmethod
+    def is_cacheable(message: Message) -> bool:
+        """Only successful, storable JSON responses are teed into the cache"""
+        if message["status"] != 200:
+            return False
+        headers = Headers(raw=message.get("headers", []))
+        if "no-store" in headers.get("cache-control", ""):
+            return False
+        return headers.get("content-type", "").startswith("application/json")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"].startswith(SKIP_CACHE_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        accept = request_headers.get("accept", "")
+        if any(media_type in accept for media_type in UNCACHED_MEDIA_TYPES):
+            await self.app(scope, receive, send)
+            return
+
+        # Runs before the route's dependencies: a changed or deactivated user
+        # must not be answered from entries cached for its previous state
+        user_id = scope.get("state", {}).get("user_id")
+        version = await get_principal_version(user_id) if user_id else 0
+        cache_key = make_cache_key(scope, version)
+        if_none_match = request_headers.get("if-none-match")
+        cached = await self.get_cache(cache_key)
+        entry = unpack_entry(cached) if cached else None
+
+        if entry is not None:
+            # Replay the stored bytes: no JSON parsing or re-encoding on a hit
+            etag, headers, body = entry
+            if etag_matches(if_none_match, etag):
+                await send_not_modified(send, etag)
+                return
+            headers.append((b"content-length", str(len(body)).encode()))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start_message: Message | None = None
+        stored_headers: RawHeaders = []
+        chunks: list[bytes] | None = None
+        size = 0
+
+        async def send_wrapper(message: Message):
+            nonlocal start_message, stored_headers, chunks, size
+            if message["type"] == "http.response.start":
+                if self.is_cacheable(message):
+                    # Hold the headers until we know whether the body fits in one message
+                    start_message = message
+                    stored_headers = list(message.get("headers", []))
+                    chunks = []
+                else:
+                    await send(message)
+                return
+
+            if message["type"] != "http.response.body" or chunks is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                held, start_message = start_message, None
+                if not more_body:
+                    # Whole body in one message: add validators, maybe answer 304
+                    etag = make_etag(body)
+                    headers = cache_headers(stored_headers, etag)
+                    if len(body) <= settings.CACHE_MAX_BODY_BYTES:
+                        await self.set_cache(cache_key, pack_entry(etag, headers, body))
+                    chunks = None
+                    if etag_matches(if_none_match, etag):
+                        await send_not_modified(send, etag)
+                        return
+                    mutable_headers = MutableHeaders(scope=held)
+                    mutable_headers["ETag"] = etag.decode("latin-1")
+                    mutable_headers.setdefault("Cache-Control", CACHE_CONTROL)
+                    await send(held)
+                    await send(message)
+                    return
+                await send(held)
+
+            size += len(body)
+            if size > settings.CACHE_MAX_BODY_BYTES:
+                chunks = None
+            else:
+                chunks.append(body)
+
+            await send(message)
+
+            if chunks is not None and not more_body:
+                body = b"".join(chunks)
+                etag = make_etag(body)
+                await self.set_cache(cache_key, pack_entry(etag, cache_headers(stored_headers, etag), body))
+                chunks = None
+
+        await self.app(scope, receive, send_wrapper)
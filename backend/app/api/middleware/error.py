@@ -1,24 +1,46 @@
-from fastapi import Request, HTTPException
+from fastapi import HTTPException
 from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
 
 logger = logging.getLogger(__name__)
 
-class ErrorMiddleware(BaseHTTPMiddleware):
+class ErrorMiddleware:
     """Error handling middleware"""
-    
-    async def dispatch(self, request: Request, call_next):
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except HTTPException as exc:
-            return JSONResponse(
+            if response_started:
+                raise
+            response = JSONResponse(
                 status_code=exc.status_code,
                 content={"detail": exc.detail},
+                headers=exc.headers,
             )
+            await response(scope, receive, send)
         except Exception as exc:
             logger.error(f"Unexpected error: {exc}")
-            return JSONResponse(
+            if response_started:
+                raise
+            response = JSONResponse(
                 status_code=500,
                 content={"detail": "Internal server error"},
-            ) 
\ No newline at end of file
+            )
+            await response(scope, receive, send)
@@ -4,11 +4,8 @@ from app.db.deps import get_db
 from app.db.repositories.users import UserRepository
 from app.schemas.user import UserCreate, User, UserLogin
 from app.schemas.token import Token, TokenPayload, RefreshTokenRequest, LogoutRequest
-from app.core.security import create_token_pair, verify_token
+from app.core.security import create_token_pair, decode_token, token_id, verify_token
 from app.services.token_service import TokenService
-from datetime import datetime
-from jose import jwt, JWTError
-from app.core.config import settings
 
 router = APIRouter()
 token_service = TokenService()
@@ -60,7 +57,7 @@ async def refresh_token(request: RefreshTokenRequest):
         )
     
     # Check if token is blacklisted
-    if await token_service.is_token_blacklisted(request.refresh_token):
+    if await token_service.is_token_blacklisted(token_id(request.refresh_token, payload)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has been revoked"
@@ -81,24 +78,13 @@ async def refresh_token(request: RefreshTokenRequest):
 
 @router.post("/logout")
 async def logout(request: LogoutRequest):
-    """Logout user and invalidate both tokens"""
+    """Logout user and invalidate both tokens (one Redis round trip)"""
+    tokens = []
     for token in [request.access_token, request.refresh_token]:
-        try:
-            payload = jwt.decode(
-                token,
-                settings.JWT_SECRET_KEY,
-                algorithms=[settings.JWT_ALGORITHM]
-            )
-            
-            user_id = payload.get("sub")
-            expires = datetime.fromtimestamp(payload.get("exp"))
-            
-            await token_service.blacklist_token(token, expires)
-            
-            if payload.get("type") == "refresh":
-                await token_service.remove_refresh_token(user_id)
-                
-        except JWTError:
-            continue
+        payload = decode_token(token)
+        if payload is not None:
+            tokens.append((token_id(token, payload), payload))
+    
+    await token_service.revoke_tokens(tokens)
     
     return {"message": "Successfully logged out"} 
\ No newline at end of file
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
+from fastapi.responses import StreamingResponse
 from app.api.deps import get_current_user
 from app.services.belvo_service import get_belvo_service, BelvoService
 from app.schemas.belvo import (
@@ -6,15 +7,24 @@ from app.schemas.belvo import (
     Account, 
     Transaction, 
     CalculatedKPI,
+    CashFlowAnalytics,
     LinkCreate, 
     Link, 
     TransactionResponse,
+    TransactionStreamSummary,
     LinkResponse,
     LinkRequest
 )
-from typing import List
-from decimal import Decimal
+from app.services.kpi import KPIAccumulator
+from typing import AsyncIterator, List, Literal
 from uuid import UUID
+import asyncio
+import logging
+import orjson
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
 router = APIRouter()
 
@@ -42,44 +52,38 @@ async def list_accounts(link_id: str, _=Depends(get_current_user)):
 
 @router.get("/{link_id}/accounts/{account_id}/transactions", response_model=TransactionResponse)
 async def list_transactions(
+    request: Request,
     link_id: str = Path(..., description="Link ID"),
     account_id: UUID = Path(..., description="Account ID"),
     date_from: str = None,
     date_to: str = None,
+    stream: bool = Query(False, description="Stream transactions as NDJSON"),
     _=Depends(get_current_user)
 ):
-    """List transactions and balance for an account"""
+    """
+    List transactions and balance for an account.
+
+    With `?stream=true` or `Accept: application/x-ndjson` the response is
+    newline-delimited JSON: one transaction per line, then a final
+    `{"summary": {"kpi": ..., "account_info": ...}}` line.
+    """
+    if stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            stream_transactions_ndjson(link_id, str(account_id), date_from, date_to),
+            media_type=NDJSON_MEDIA_TYPE
+        )
+
     try:
         service = get_belvo_service()
         
         # Obtener datos en paralelo
-        transactions = await service.get_transactions(
-            link_id, 
+        transactions, kpi, account_info = await service.get_transactions_overview(
+            link_id,
             str(account_id),
             date_from=date_from,
             date_to=date_to
         )
         
-        # Calcular balance
-        total_income = Decimal(0)
-        total_expenses = Decimal(0)
-        
-        for transaction in transactions:
-            amount = Decimal(str(transaction["amount"]))
-            if transaction["type"] == "INFLOW":
-                total_income += amount
-            else:
-                total_expenses += amount
-                
-        kpi = CalculatedKPI(
-            total_income=total_income,
-            total_expenses=total_expenses,
-            net_balance=total_income - total_expenses
-        )
-        
-        # Obtener info de la cuenta
-        account_info = await service.get_account_details(link_id, str(account_id))
-        
         return TransactionResponse(
             transactions=transactions,
             kpi=kpi,
@@ -88,6 +92,36 @@ async def list_transactions(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def stream_transactions_ndjson(
+    link_id: str,
+    account_id: str,
+    date_from: str = None,
+    date_to: str = None
+) -> AsyncIterator[bytes]:
+    """Encode transactions one line at a time, KPIs accumulated on the way"""
+    service = get_belvo_service()
+    account_task = asyncio.create_task(service.get_account_details(link_id, account_id))
+    kpi = KPIAccumulator()
+    try:
+        async for transaction in service.stream_transactions(
+            link_id, account_id, date_from=date_from, date_to=date_to
+        ):
+            kpi.add(transaction)
+            yield Transaction.model_validate(transaction).model_dump_json().encode() + b"\n"
+
+        summary = TransactionStreamSummary(kpi=kpi.result(), account_info=await account_task)
+        yield b'{"summary":' + summary.model_dump_json().encode() + b"}\n"
+    except Exception as e:
+        # Headers are already sent, report the failure in-band
+        logger.error(f"Transaction stream failed: {e}")
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        yield orjson.dumps({"error": detail}) + b"\n"
+    finally:
+        if not account_task.done():
+            account_task.cancel()
+        elif not account_task.cancelled():
+            account_task.exception()
+
 @router.get("/{link_id}/accounts/{account_id}/balance", response_model=CalculatedKPI)
 async def get_balance(
     link_id: str = Path(..., description="Link ID"),
@@ -97,22 +131,30 @@ async def get_balance(
     """Get balance for an account"""
     try:
         service = get_belvo_service()
-        transactions = await service.get_transactions(link_id, str(account_id))
-        
-        total_income = Decimal(0)
-        total_expenses = Decimal(0)
-        
-        for transaction in transactions:
-            amount = Decimal(str(transaction["amount"]))
-            if transaction["type"] == "INFLOW":
-                total_income += amount
-            else:
-                total_expenses += amount
-        
-        return CalculatedKPI(
-            total_income=total_income,
-            total_expenses=total_expenses,
-            net_balance=total_income - total_expenses
+        return await service.get_kpi(link_id, str(account_id))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{link_id}/accounts/{account_id}/analytics", response_model=CashFlowAnalytics)
+async def get_cash_flow(
+    link_id: str = Path(..., description="Link ID"),
+    account_id: UUID = Path(..., description="Account ID"),
+    granularity: Literal["daily", "weekly", "monthly"] = Query("monthly"),
+    date_from: str = None,
+    date_to: str = None,
+    top: int = Query(10, ge=1, le=100, description="Number of top merchants"),
+    _=Depends(get_current_user)
+):
+    """Income vs expenses per period and per category/subcategory, and top merchants by spend"""
+    try:
+        service = get_belvo_service()
+        return await service.get_cash_flow(
+            link_id,
+            str(account_id),
+            granularity=granularity,
+            date_from=date_from,
+            date_to=date_to,
+            top_merchants=top
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from app.api.deps import get_current_user
+from app.core.cache import get_cache
+from app.core.passwords import get_password_hasher_stats
+from app.core.redis import get_redis_pool_stats
+from app.core.revocations import get_revocation_filter
+from app.core.security import token_claims_cache
+from app.jobs.queue import get_job_queue
+from app.services.http_client import get_belvo_pool_stats
+
+router = APIRouter()
+
+@router.get("")
+async def read_metrics(_=Depends(get_current_user)):
+    """Runtime metrics for the current worker"""
+    return {
+        "belvo_http": get_belvo_pool_stats(),
+        "redis": get_redis_pool_stats(),
+        "cache": get_cache().stats(),
+        "jobs": await get_job_queue().stats(),
+        "password_hashing": get_password_hasher_stats(),
+        "token_claims_cache": token_claims_cache.stats(),
+        "revoked_tokens_filter": get_revocation_filter().stats(),
+    }
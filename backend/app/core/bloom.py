@@ -0,0 +1,63 @@
+"""
+Bloom filter over strings.
+
+A bit array of m bits and k probes per item, placed by double hashing
+(h1 + i*h2) on a 128-bit BLAKE2b digest. No false negatives; the false
+positive rate stays near `error_rate` as long as no more than `capacity`
+items are added. Bulk inserts set the bits with NumPy.
+"""
+from typing import Iterable
+import hashlib
+import math
+import numpy as np
+
+MASK64 = (1 << 64) - 1
+
+
+def _hashes(item: str) -> tuple[int, int]:
+    digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+    # An odd step visits k distinct positions
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """Probabilistic set of strings: `in` may be wrong only by saying yes"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    def _positions(self, item: str):
+        h1, h2 = _hashes(item)
+        return (((h1 + i * h2) & MASK64) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        bits = self._bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[str]):
+        """Add many items at once"""
+        hashes = np.array([_hashes(item) for item in items], dtype=np.uint64).reshape(-1, 2)
+        if not len(hashes):
+            return
+        # uint64 arithmetic wraps like the & MASK64 of the single-item path
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        positions = (hashes[:, :1] + steps * hashes[:, 1:]) % np.uint64(self.size)
+        positions = positions.ravel()
+        bits = np.frombuffer(self._bits, dtype=np.uint8)
+        np.bitwise_or.at(bits, positions >> np.uint64(3), np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+        self.count += len(hashes)
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
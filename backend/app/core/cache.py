@@ -0,0 +1,229 @@
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+import asyncio
+import logging
+import secrets
+import time
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+CacheValue = str | bytes
+
+
+class LRUCache:
+    """Bounded in-process LRU with per-entry TTL, limited by entries and bytes"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Tuple[CacheValue, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> CacheValue | None:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: CacheValue, ttl: float, size: int | None = None):
+        """Store `value`, counted as `size` bytes (its length by default)"""
+        size = len(value) if size is None else size
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+        self.delete(key)
+        self._data[key] = (value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        if key in self._data:
+            self._remove(key)
+
+    def clear(self):
+        self._data.clear()
+        self._bytes = 0
+
+    def _remove(self, key: str):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class TwoTierCache:
+    """
+    In-process LRU (L1) in front of Redis (L2).
+
+    Every write or delete is announced on a pub/sub channel so the other
+    workers drop their L1 copy; the short L1 TTL bounds staleness if an
+    invalidation message is ever missed.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis | None = None,
+        l1: LRUCache | None = None,
+        l1_ttl: float = settings.CACHE_L1_TTL,
+        channel: str = settings.CACHE_INVALIDATION_CHANNEL,
+    ):
+        self._redis = redis
+        self.l1 = l1 or LRUCache(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_MAX_BYTES)
+        self.l1_ttl = l1_ttl
+        self.channel = channel
+        self.origin = secrets.token_hex(8)
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+        self._listener: asyncio.Task | None = None
+
+    @property
+    def redis(self) -> aioredis.Redis:
+        return self._redis or get_redis()
+
+    async def get(self, key: str) -> CacheValue | None:
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+        try:
+            value = await self.redis.get(key)
+        except RedisError:
+            self.l2_errors += 1
+            return None
+        if value is None:
+            self.l2_misses += 1
+            return None
+        self.l2_hits += 1
+        self.l1.set(key, value, self.l1_ttl)
+        return value
+
+    async def set(self, key: str, value: CacheValue, ttl: int):
+        self.l1.set(key, value, min(self.l1_ttl, ttl))
+        try:
+            await self.redis.set(key, value, ex=ttl)
+            await self._publish(key)
+        except RedisError:
+            self.l2_errors += 1
+
+    async def delete(self, key: str):
+        self.l1.delete(key)
+        try:
+            await self.redis.delete(key)
+            await self._publish(key)
+        except RedisError:
+            self.l2_errors += 1
+
+    async def _publish(self, key: str):
+        await self.redis.publish(self.channel, f"{self.origin}:{key}")
+
+    def _on_message(self, data: CacheValue):
+        if isinstance(data, bytes):
+            data = data.decode()
+        origin, _, key = data.partition(":")
+        if origin != self.origin:
+            self.l1.delete(key)
+
+    async def _listen(self):
+        """Apply invalidations from other workers, reconnecting on errors"""
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                # Anything cached before (re)subscribing may have missed an invalidation
+                self.l1.clear()
+                while True:
+                    # An explicit timeout overrides the pool's socket_timeout: an idle
+                    # channel returns None instead of raising and dropping the connection
+                    message = await pubsub.get_message(timeout=settings.REDIS_HEALTH_CHECK_INTERVAL)
+                    if message is not None and message["type"] == "message":
+                        self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.l1.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "l1": self.l1.stats(),
+            "l2": {
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "errors": self.l2_errors,
+            },
+        }
+
+
+_cache: TwoTierCache | None = None
+
+
+def init_cache() -> TwoTierCache:
+    """Create the worker-wide cache and start its invalidation listener"""
+    cache = get_cache()
+    cache.start()
+    return cache
+
+
+async def close_cache():
+    """Stop the invalidation listener"""
+    global _cache
+    if _cache is not None:
+        await _cache.stop()
+        _cache = None
+
+
+def get_cache() -> TwoTierCache:
+    """Get the shared two-tier cache"""
+    global _cache
+    if _cache is None:
+        _cache = TwoTierCache()
+    return _cache
@@ -0,0 +1,68 @@
+"""
+Binary encoding for cached values.
+
+Every payload starts with one header byte: the format version in the high
+nibble and flags in the low nibble. Objects are serialized with orjson and
+payloads larger than CACHE_COMPRESSION_MIN_BYTES are compressed with zstd.
+Values written before this format existed (plain JSON text) are still read.
+"""
+from typing import Any
+import orjson
+import zstandard
+from app.core.config import settings
+
+FORMAT_VERSION = 1
+FLAG_COMPRESSED = 0x01
+FLAG_RAW = 0x02  # opaque bytes rather than a serialized object
+
+_compressor = zstandard.ZstdCompressor(level=settings.CACHE_COMPRESSION_LEVEL)
+_decompressor = zstandard.ZstdDecompressor()
+
+
+def _pack(data: bytes, flags: int) -> bytes:
+    if len(data) >= settings.CACHE_COMPRESSION_MIN_BYTES:
+        data = _compressor.compress(data)
+        flags |= FLAG_COMPRESSED
+    return bytes(((FORMAT_VERSION << 4) | flags,)) + data
+
+
+def _unpack(payload: bytes) -> tuple[bytes, int] | None:
+    """Return (data, flags), or None for legacy JSON text"""
+    if not payload or payload[0] >> 4 != FORMAT_VERSION:
+        return None
+    flags = payload[0] & 0x0F
+    data = payload[1:]
+    if flags & FLAG_COMPRESSED:
+        data = _decompressor.decompress(data)
+    return data, flags
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a JSON-compatible object"""
+    return _pack(orjson.dumps(value), 0)
+
+
+def loads(payload: bytes | str) -> Any:
+    """Deserialize a value written by `dumps` (or legacy JSON text)"""
+    if isinstance(payload, str):
+        return orjson.loads(payload)
+    unpacked = _unpack(payload)
+    if unpacked is None:
+        return orjson.loads(payload)
+    data, flags = unpacked
+    if flags & FLAG_RAW:
+        raise ValueError("Payload holds raw bytes, use unpack_bytes")
+    return orjson.loads(data)
+
+
+def pack_bytes(data: bytes) -> bytes:
+    """Wrap already-serialized bytes (e.g. a response body)"""
+    return _pack(data, FLAG_RAW)
+
+
+def unpack_bytes(payload: bytes) -> bytes:
+    """Unwrap bytes written by `pack_bytes`"""
+    unpacked = _unpack(payload)
+    if unpacked is None:
+        return payload
+    return unpacked[0]
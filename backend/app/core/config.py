@@ -1,3 +1,4 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -14,6 +15,12 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     MIN_BLACKLIST_TIME: int = 3600
+    TOKEN_CLAIMS_CACHE_MAX_ENTRIES: int = 10_000
+    PRINCIPAL_CACHE_TTL: int = 60
+
+    # Password hashing (bcrypt on a per-worker thread pool)
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
     
     # Database
     POSTGRES_HOST: str
@@ -26,10 +33,39 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 20
+    REDIS_POOL_TIMEOUT: int = 5
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_SOCKET_TIMEOUT: float = 5.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5.0
+
+    # Response cache
+    CACHE_TTL: int = 300
+    CACHE_MAX_BODY_BYTES: int = 1_048_576
+    CACHE_L1_TTL: int = 30
+    CACHE_L1_MAX_ENTRIES: int = 10_000
+    CACHE_L1_MAX_BYTES: int = 64 * 1_048_576
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    CACHE_COMPRESSION_MIN_BYTES: int = 512
+    CACHE_COMPRESSION_LEVEL: int = 3
+
+    # Revoked tokens filter (per-worker Bloom filter, see app.core.revocations)
+    BLACKLIST_STREAM: str = "revocations:stream"
+    BLACKLIST_STREAM_MAX_LEN: int = 100_000
+    BLACKLIST_STREAM_BLOCK_MS: int = 1000
+    BLACKLIST_FILTER_CAPACITY: int = 1_000_000
+    BLACKLIST_FILTER_ERROR_RATE: float = 0.001
+    BLACKLIST_FILTER_REBUILD_INTERVAL: int = 3600
 
     # Redis keys prefixes
     REDIS_REFRESH_TOKEN_KEY_PREFIX: str = "refresh_tokens:"
     REDIS_BLACKLIST_KEY_PREFIX: str = "blacklist:"
+    REDIS_LOCK_KEY_PREFIX: str = "lock:"
+    REDIS_LINK_FRESHNESS_KEY_PREFIX: str = "link_freshness:"
+
+    # Single-flight loads (cache miss coalescing)
+    SINGLEFLIGHT_LOCK_TTL: int = 30
+    SINGLEFLIGHT_POLL_INTERVAL: float = 0.1
 
     # Belvo
     BELVO_SECRET_ID: str
@@ -38,6 +74,60 @@ class Settings(BaseSettings):
     BELVO_DEFAULT_USERNAME: str = "12345678901"
     BELVO_DEFAULT_PASSWORD: str = "123456"
 
+    # Transactions pagination
+    BELVO_TRANSACTIONS_PAGE_SIZE: int = 1000
+    BELVO_PAGE_CONCURRENCY: int = 4
+
+    # Local transaction store (incremental sync)
+    TRANSACTIONS_SYNC_INTERVAL: int = 300
+    TRANSACTIONS_SYNC_OVERLAP_DAYS: int = 1
+    TRANSACTIONS_INITIAL_SYNC_DAYS: int = 90
+    TRANSACTIONS_RETENTION_MONTHS: int = 24
+    TRANSACTIONS_PRUNE_INTERVAL: int = 24 * 3600
+
+    # Link freshness (bank re-scrapes run in the background, never on reads)
+    LINK_REFRESH_INTERVAL: int = 6 * 3600
+    LINK_REFRESH_LOCK_TTL: int = 300
+    LINK_POLICY_TTL: int = 3600
+    LINK_FRESHNESS_TTL: int = 30 * 24 * 3600
+    LINK_REFRESH_ENQUEUE_INTERVAL: int = 60
+    LINK_REFRESH_SCHEDULE_INTERVAL: int = 15 * 60
+
+    # Background jobs (Redis Streams consumer group, see app.jobs)
+    JOBS_STREAM: str = "jobs:stream"
+    JOBS_GROUP: str = "jobs:workers"
+    JOBS_DELAYED_KEY: str = "jobs:delayed"
+    JOBS_DEAD_LETTER_STREAM: str = "jobs:dead"
+    JOBS_STREAM_MAX_LEN: int = 100_000
+    JOBS_CONCURRENCY: int = 8
+    JOBS_SCRAPE_CONCURRENCY: int = 4
+    JOBS_MAX_ATTEMPTS: int = 5
+    JOBS_RETRY_BACKOFF: float = 5.0
+    JOBS_TIMEOUT: float = 240.0
+    JOBS_VISIBILITY_TIMEOUT: int = 300
+    JOBS_BLOCK_MS: int = 2000
+    JOBS_SCHEDULER_TICK: float = 30.0
+    JOBS_SHUTDOWN_TIMEOUT: float = 30.0
+
+    # Cash-flow analytics (columnar copies of accounts kept per worker)
+    ANALYTICS_COLUMNS_TTL: int = 3600
+    ANALYTICS_COLUMNS_MAX_ENTRIES: int = 1000
+    ANALYTICS_COLUMNS_MAX_BYTES: int = 256 * 1024 * 1024
+
+    # Institutions catalog cache (stale-while-revalidate)
+    INSTITUTIONS_SOFT_TTL: int = 6 * 3600
+    INSTITUTIONS_HARD_TTL: int = 7 * 24 * 3600
+
+    # Belvo HTTP client (one pooled client per worker)
+    BELVO_HTTP2: bool = False
+    BELVO_HTTP_MAX_CONNECTIONS: int = 100
+    BELVO_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    BELVO_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    BELVO_HTTP_CONNECT_TIMEOUT: float = 5.0
+    BELVO_HTTP_READ_TIMEOUT: float = 30.0
+    BELVO_HTTP_WRITE_TIMEOUT: float = 10.0
+    BELVO_HTTP_POOL_TIMEOUT: float = 5.0
+
     # Default credentials por tipo de institución
     BANK_DEFAULT_USERNAME: str = "user123"
     BANK_DEFAULT_PASSWORD: str = "pass123"
@@ -49,6 +139,13 @@ class Settings(BaseSettings):
     FISCAL_DEFAULT_RFC: str = "XAXX010101000"
     FISCAL_DEFAULT_PASSWORD: str = "pass123"
 
+    @model_validator(mode="after")
+    def jobs_finish_before_reclaim(self) -> "Settings":
+        # A job still running past the visibility timeout is claimed and run again elsewhere
+        if self.JOBS_TIMEOUT >= self.JOBS_VISIBILITY_TIMEOUT:
+            raise ValueError("JOBS_TIMEOUT must be shorter than JOBS_VISIBILITY_TIMEOUT")
+        return self
+
     class Config:
         case_sensitive = True
         env_file = ".env"
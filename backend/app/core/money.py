@@ -0,0 +1,43 @@
+"""
+Money amounts as integer minor units (cents) plus an ISO 4217 currency code.
+
+Amounts are converted once, when a transaction is ingested, and added up as
+plain ints. They only become Decimal again when a response is built.
+"""
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Union
+
+DEFAULT_EXPONENT = 2
+
+# Currencies whose minor unit is not 1/100
+CURRENCY_EXPONENTS = {
+    "CLP": 0,
+    "JPY": 0,
+    "KRW": 0,
+    "PYG": 0,
+    "UYI": 0,
+    "BHD": 3,
+    "KWD": 3,
+}
+
+
+def exponent(currency: str | None) -> int:
+    """Number of decimal digits of the currency's minor unit"""
+    return CURRENCY_EXPONENTS.get(currency, DEFAULT_EXPONENT)
+
+
+def to_minor(amount: Union[int, float, str, Decimal], currency: str | None) -> int:
+    """Amount in minor units, rounded half to even"""
+    scale = 10 ** exponent(currency)
+    if isinstance(amount, int):
+        return amount * scale
+    if isinstance(amount, float):
+        # Belvo sends at most the currency's decimals, so this matches the
+        # Decimal(str(amount)) result for any realistic amount and is much faster
+        return round(amount * scale)
+    return int(Decimal(amount).scaleb(exponent(currency)).to_integral_value(ROUND_HALF_EVEN))
+
+
+def to_decimal(minor: int, currency: str | None) -> Decimal:
+    """Minor units back to a Decimal amount with the currency's precision"""
+    return Decimal(minor).scaleb(-exponent(currency))
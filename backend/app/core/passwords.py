@@ -0,0 +1,116 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is slow on purpose (hundreds of ms at the usual cost factors) and
+would stall every request on the worker while it runs. Hashes and checks go
+to a small dedicated thread pool instead; bcrypt releases the GIL, so the
+threads really hash in parallel and the event loop keeps serving.
+"""
+from typing import Any, Callable, Dict, Tuple, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+from app.core.config import settings
+from app.core.security import pwd_context
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """bcrypt on a bounded thread pool, with queue and latency metrics"""
+
+    def __init__(self, max_workers: int = settings.PASSWORD_HASH_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="password-hash")
+        self._submitted = 0
+        self._completed = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._max_run_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost factor"""
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> Tuple[bool, str | None]:
+        """
+        Check a password. Also returns a new hash when the stored one was made
+        with another cost factor (None otherwise), for the caller to save.
+        """
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+    async def _run(self, function: Callable[..., T], *args) -> T:
+        submitted_at = time.perf_counter()
+
+        def timed():
+            started_at = time.perf_counter()
+            result = function(*args)
+            return result, started_at, time.perf_counter()
+
+        self._submitted += 1
+        try:
+            result, started_at, finished_at = await asyncio.get_running_loop().run_in_executor(
+                self._executor, timed
+            )
+        finally:
+            self._completed += 1
+
+        # Counters are only touched from the event loop thread
+        wait, run = started_at - submitted_at, finished_at - started_at
+        self._wait_seconds += wait
+        self._run_seconds += run
+        self._max_wait_seconds = max(self._max_wait_seconds, wait)
+        self._max_run_seconds = max(self._max_run_seconds, run)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        in_flight = self._submitted - self._completed
+        completed = self._completed or 1
+        return {
+            "workers": self.max_workers,
+            "rounds": settings.PASSWORD_BCRYPT_ROUNDS,
+            "running": min(in_flight, self.max_workers),
+            "queued": max(in_flight - self.max_workers, 0),
+            "completed": self._completed,
+            "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2),
+            "avg_run_ms": round(self._run_seconds / completed * 1000, 2),
+            "max_wait_ms": round(self._max_wait_seconds * 1000, 2),
+            "max_run_ms": round(self._max_run_seconds * 1000, 2),
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_hasher: PasswordHasher | None = None
+
+
+def init_password_hasher() -> PasswordHasher:
+    """Create the worker-wide password hasher (called from the app lifespan)"""
+    global _hasher
+    if _hasher is None:
+        _hasher = PasswordHasher()
+    return _hasher
+
+
+def close_password_hasher():
+    """Stop the hashing threads"""
+    global _hasher
+    if _hasher is not None:
+        _hasher.shutdown()
+        _hasher = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get the shared password hasher, creating it if the lifespan did not run"""
+    if _hasher is None:
+        return init_password_hasher()
+    return _hasher
+
+
+def get_password_hasher_stats() -> Dict[str, Any]:
+    """Queue depth and latency of the shared password hasher"""
+    if _hasher is None:
+        return {"initialized": False, "workers": settings.PASSWORD_HASH_WORKERS}
+    return {"initialized": True, **_hasher.stats()}
@@ -0,0 +1,55 @@
+"""
+Authenticated principals (id, email, username, is_active) in the two-tier
+cache, so authenticated requests do not read the users table.
+
+Entries live for PRINCIPAL_CACHE_TTL at most. Anything that changes a user
+row must call invalidate_principal, which also drops the copy held by the
+other workers and bumps the user's version. The response cache keys entries
+by that version, so responses cached for the old user stop being served too.
+"""
+import time
+from app.core import codec
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.schemas.user import User
+
+
+def _principal_key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+
+async def get_cached_principal(user_id: int) -> User | None:
+    """The cached principal of a user, None on a miss"""
+    cached = await get_cache().get(_principal_key(user_id))
+    return User.model_validate(codec.loads(cached)) if cached else None
+
+
+async def cache_principal(principal: User):
+    await get_cache().set(
+        _principal_key(principal.id), codec.dumps(principal.model_dump()), settings.PRINCIPAL_CACHE_TTL
+    )
+
+
+def _version_key(user_id: int | str) -> str:
+    return f"principal-version:{user_id}"
+
+
+async def get_principal_version(user_id: int | str) -> int:
+    """Version of a user's cached data, bumped by invalidate_principal"""
+    cache = get_cache()
+    key = _version_key(user_id)
+    version = await cache.get(key)
+    if version is None:
+        # Never bumped: remember that in L1 so each request does not ask Redis
+        # (a bump drops it from every worker's L1)
+        version = b"0"
+        cache.l1.set(key, version, cache.l1_ttl)
+    return int(version)
+
+
+async def invalidate_principal(user_id: int):
+    """Forget a user's principal, and the responses cached for it, in every worker"""
+    cache = get_cache()
+    await cache.delete(_principal_key(user_id))
+    # Outlives the responses cached under the previous version
+    await cache.set(_version_key(user_id), str(time.time_ns()), 2 * settings.CACHE_TTL)
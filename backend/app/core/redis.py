@@ -0,0 +1,63 @@
+from typing import Dict, Any
+from redis import asyncio as aioredis
+from app.core.config import settings
+
+_pool: aioredis.BlockingConnectionPool | None = None
+_client: aioredis.Redis | None = None
+
+
+def create_redis_pool() -> aioredis.BlockingConnectionPool:
+    """Build the bounded Redis connection pool shared by the whole worker"""
+    return aioredis.BlockingConnectionPool.from_url(
+        f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
+        password=settings.REDIS_PASSWORD or None,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        # Cache payloads are binary (see app.core.codec)
+        decode_responses=False,
+    )
+
+
+def init_redis() -> aioredis.Redis:
+    """Create the worker-wide Redis client (called from the app lifespan)"""
+    global _pool, _client
+    if _client is None:
+        _pool = create_redis_pool()
+        _client = aioredis.Redis(connection_pool=_pool)
+    return _client
+
+
+async def close_redis():
+    """Close the Redis client and disconnect every pooled connection"""
+    global _pool, _client
+    if _client is not None:
+        await _client.aclose()
+        await _pool.disconnect()
+        _client = None
+        _pool = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Get the shared Redis client, creating it if the lifespan did not run"""
+    if _client is None:
+        return init_redis()
+    return _client
+
+
+def get_redis_pool_stats() -> Dict[str, Any]:
+    """Connection pool statistics for the shared Redis client"""
+    if _pool is None:
+        return {"initialized": False, "max_connections": settings.REDIS_MAX_CONNECTIONS}
+
+    in_use = len(getattr(_pool, "_in_use_connections", ()))
+    idle = len(getattr(_pool, "_available_connections", ()))
+    return {
+        "initialized": True,
+        "max_connections": _pool.max_connections,
+        "connections": in_use + idle,
+        "in_use": in_use,
+        "idle": idle,
+    }
@@ -0,0 +1,173 @@
+"""
+Per-worker filter of revoked tokens.
+
+Almost every authenticated request carries a token that was never revoked,
+so each worker keeps a Bloom filter of the blacklisted ids and only asks
+Redis about the tokens the filter might contain.
+
+The filter is built by scanning the blacklist keys and kept current from a
+Redis stream every revocation is appended to. It is rebuilt every
+BLACKLIST_FILTER_REBUILD_INTERVAL (Bloom filters cannot forget, the rebuild
+drops expired entries) while the stream keeps feeding both copies. Until the
+first build completes, or after the stream connection fails, `might_contain`
+says yes to everything so every check falls back to Redis.
+"""
+from typing import Any, Dict
+import asyncio
+import logging
+from redis import asyncio as aioredis
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationFilter:
+    """Bloom filter of blacklisted token ids, synced from Redis"""
+
+    def __init__(self, redis: aioredis.Redis | None = None):
+        self._redis = redis
+        self._filter: BloomFilter | None = None
+        self._next: BloomFilter | None = None
+        self._task: asyncio.Task | None = None
+        self.checks = 0
+        self.skipped = 0
+        self.rebuilds = 0
+
+    @property
+    def redis(self) -> aioredis.Redis:
+        return self._redis or get_redis()
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def might_contain(self, token_id: str) -> bool:
+        """False only if the token is certainly not revoked"""
+        self.checks += 1
+        if self._filter is None or token_id in self._filter:
+            return True
+        self.skipped += 1
+        return False
+
+    def add(self, token_id: str):
+        for bloom in (self._filter, self._next):
+            if bloom is not None:
+                bloom.add(token_id)
+
+    def publish(self, pipe: aioredis.client.Pipeline, token_id: str):
+        """
+        Queue the announcement of a revocation to every worker on `pipe`
+        (sent with the caller's other commands) and add it here right away
+        """
+        self.add(token_id)
+        pipe.xadd(
+            settings.BLACKLIST_STREAM, {"id": token_id},
+            maxlen=settings.BLACKLIST_STREAM_MAX_LEN, approximate=True
+        )
+
+    async def _rebuild(self):
+        """Build a new filter from the blacklist keys and swap it in"""
+        capacity = settings.BLACKLIST_FILTER_CAPACITY
+        if self._filter is not None:
+            capacity = max(capacity, 2 * self._filter.count)
+        self._next = BloomFilter(capacity, settings.BLACKLIST_FILTER_ERROR_RATE)
+        prefix = settings.REDIS_BLACKLIST_KEY_PREFIX
+        batch = []
+        async for key in self.redis.scan_iter(match=f"{prefix}*", count=1000, _type="string"):
+            batch.append(key.decode()[len(prefix):])
+            if len(batch) >= 1000:
+                self._next.update(batch)
+                batch = []
+        self._next.update(batch)
+        self._filter, self._next = self._next, None
+        self.rebuilds += 1
+
+    async def _follow(self):
+        """Apply revocations from the stream; rebuilds run alongside"""
+        # Read the stream from before the scan, so nothing revoked meanwhile is missed
+        last = await self.redis.xrevrange(settings.BLACKLIST_STREAM, count=1)
+        last_id = last[0][0] if last else b"0-0"
+        loop = asyncio.get_running_loop()
+        rebuild = asyncio.create_task(self._rebuild())
+        rebuild_at = loop.time() + settings.BLACKLIST_FILTER_REBUILD_INTERVAL
+        try:
+            while True:
+                if rebuild.done():
+                    rebuild.result()
+                    if loop.time() >= rebuild_at:
+                        rebuild = asyncio.create_task(self._rebuild())
+                        rebuild_at = loop.time() + settings.BLACKLIST_FILTER_REBUILD_INTERVAL
+
+                response = await self.redis.xread(
+                    {settings.BLACKLIST_STREAM: last_id}, count=1000, block=settings.BLACKLIST_STREAM_BLOCK_MS
+                )
+                for _, messages in response:
+                    for message_id, fields in messages:
+                        self.add(fields[b"id"].decode())
+                        last_id = message_id
+        finally:
+            rebuild.cancel()
+
+    async def _run(self):
+        while True:
+            try:
+                await self._follow()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Revocations may have been missed: check Redis until rebuilt
+                logger.warning(f"Revoked tokens filter out of sync: {e}")
+                self._filter = self._next = None
+                await asyncio.sleep(1)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._filter = self._next = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "entries": self._filter.count if self._filter else 0,
+            "bytes": self._filter.nbytes if self._filter else 0,
+            "checks": self.checks,
+            "redis_skipped": self.skipped,
+            "rebuilds": self.rebuilds,
+        }
+
+
+_filter: RevocationFilter | None = None
+
+
+def init_revocation_filter() -> RevocationFilter:
+    """Create the worker-wide filter and start syncing it"""
+    revocations = get_revocation_filter()
+    revocations.start()
+    return revocations
+
+
+async def close_revocation_filter():
+    """Stop syncing the filter"""
+    global _filter
+    if _filter is not None:
+        await _filter.stop()
+        _filter = None
+
+
+def get_revocation_filter() -> RevocationFilter:
+    """Get the shared filter (not started, so always 'maybe', if the lifespan did not run)"""
+    global _filter
+    if _filter is None:
+        _filter = RevocationFilter()
+    return _filter
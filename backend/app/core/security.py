@@ -2,17 +2,27 @@ from datetime import datetime, timedelta
 from typing import Any, Tuple
 from passlib.context import CryptContext
 from jose import jwt
+from app.core.cache import LRUCache
 from app.core.config import settings
+import hashlib
 import secrets
+import time
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with another cost factor are flagged for rehashing on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
 
 def create_token_pair(subject: Any) -> Tuple[str, str]:
     """Create access and refresh token pair"""
     # Access token
     access_expires = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = jwt.encode(
-        {"exp": access_expires, "sub": str(subject), "type": "access"},
+        {"exp": access_expires, "sub": str(subject), "type": "access", "jti": secrets.token_urlsafe(12)},
         settings.JWT_SECRET_KEY,
         algorithm=settings.JWT_ALGORITHM
     )
@@ -20,31 +30,45 @@ def create_token_pair(subject: Any) -> Tuple[str, str]:
     # Refresh token
     refresh_expires = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     refresh_token = jwt.encode(
-        {"exp": refresh_expires, "sub": str(subject), "type": "refresh"},
+        {"exp": refresh_expires, "sub": str(subject), "type": "refresh", "jti": secrets.token_urlsafe(12)},
         settings.JWT_SECRET_KEY,
         algorithm=settings.JWT_ALGORITHM
     )
     
     return access_token, refresh_token
 
+# Verified claims by token digest, kept until the token expires. Only tokens
+# that passed verification get in, so garbage tokens cannot flush it. Entries
+# count as one byte each: the entry limit is the only bound.
+token_claims_cache = LRUCache(
+    settings.TOKEN_CLAIMS_CACHE_MAX_ENTRIES, settings.TOKEN_CLAIMS_CACHE_MAX_ENTRIES
+)
+
+def decode_token(token: str) -> dict | None:
+    """Verify a JWT of any type and return its payload (read-only, it is shared)"""
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    payload = token_claims_cache.get(digest)
+    if payload is None:
+        try:
+            payload = jwt.decode(
+                token,
+                settings.JWT_SECRET_KEY,
+                algorithms=[settings.JWT_ALGORITHM]
+            )
+        except jwt.JWTError:
+            return None
+        ttl = payload.get("exp", 0) - time.time()
+        if ttl > 0:
+            token_claims_cache.set(digest, payload, ttl, size=1)
+    return payload
+
 def verify_token(token: str, token_type: str = "access") -> dict:
-    """Verify JWT token and return payload"""
-    try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-        if payload.get("type") != token_type:
-            raise jwt.JWTError("Invalid token type")
-        return payload
-    except jwt.JWTError:
+    """Verify JWT token and return payload (treat it as read-only, it is shared)"""
+    payload = decode_token(token)
+    if payload is None or payload.get("type") != token_type:
         return None
+    return payload
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password"""
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    """Get password hash"""
-    return pwd_context.hash(password) 
\ No newline at end of file
+def token_id(token: str, payload: dict) -> str:
+    """Revocation id of a token: its jti, or the whole token if it was issued without one"""
+    return payload.get("jti") or token
@@ -0,0 +1,122 @@
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+import asyncio
+import secrets
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from app.core.config import settings
+from app.core.redis import get_redis
+
+T = TypeVar("T")
+
+# Delete the lock only if we still own it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Push the lock's expiry back only if we still own it
+EXTEND_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+class SingleFlight:
+    """
+    Coalesce concurrent loads of the same key.
+
+    Callers in the same worker share one in-flight task. Across workers a Redis
+    lock elects a single loader; the others poll `lookup` (usually the cache
+    the loader writes to) until the value shows up or the lock is released.
+    The loader keeps extending the lock while it runs, so a slow load (many
+    pages, retries) does not let a second worker become loader as well.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis | None = None,
+        lock_ttl: int = settings.SINGLEFLIGHT_LOCK_TTL,
+        poll_interval: float = settings.SINGLEFLIGHT_POLL_INTERVAL,
+    ):
+        self._redis = redis
+        self._lock_ttl = lock_ttl
+        self._poll_interval = poll_interval
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @property
+    def redis(self) -> aioredis.Redis:
+        return self._redis or get_redis()
+
+    async def do(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[T]],
+        lookup: Optional[Callable[[], Awaitable[Optional[T]]]] = None,
+    ) -> T:
+        """Run `fetch` once per key, every concurrent caller gets its result"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, fetch, lookup))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # A cancelled caller must not cancel the load the others are waiting on
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _load(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[T]],
+        lookup: Optional[Callable[[], Awaitable[Optional[T]]]],
+    ) -> T:
+        lock_key = f"{settings.REDIS_LOCK_KEY_PREFIX}{key}"
+        token = secrets.token_hex(8)
+
+        while True:
+            try:
+                acquired = await self.redis.set(lock_key, token, nx=True, ex=self._lock_ttl)
+            except RedisError:
+                # Without Redis we can still coalesce within this worker
+                return await fetch()
+
+            if acquired:
+                watchdog = asyncio.create_task(self._keep_lock(lock_key, token))
+                try:
+                    return await fetch()
+                finally:
+                    watchdog.cancel()
+                    try:
+                        await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                    except RedisError:
+                        pass
+
+            # Another worker is loading (for as long as it holds the lock): wait for its result
+            while True:
+                await asyncio.sleep(self._poll_interval)
+                if lookup is not None:
+                    value = await lookup()
+                    if value is not None:
+                        return value
+                try:
+                    if not await self.redis.exists(lock_key):
+                        break
+                except RedisError:
+                    break
+
+    async def _keep_lock(self, lock_key: str, token: str):
+        """Extend the lock every third of its TTL until the load is done"""
+        while True:
+            await asyncio.sleep(self._lock_ttl / 3)
+            try:
+                if not await self.redis.eval(EXTEND_LOCK_SCRIPT, 1, lock_key, token, self._lock_ttl):
+                    return
+            except RedisError:
+                pass
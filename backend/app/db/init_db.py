@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.models.user import Base
+from app.db.models.base import Base
+from app.db.models import user, transaction  # noqa: F401 (register tables)
 from app.db.session import engine
 
 async def init_db() -> None:
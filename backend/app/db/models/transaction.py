@@ -0,0 +1,69 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, Date, Integer, BigInteger, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.models.base import Base
+
+class Transaction(Base):
+    """Belvo transaction stored locally, keyed by its Belvo id.
+
+    Range-partitioned by month of value_date (see app.db.partitions), so the
+    partition key is part of the primary key.
+    """
+
+    __tablename__ = "transactions"
+
+    id = Column(String, primary_key=True)
+    link_id = Column(String, nullable=False, index=True)
+    account_id = Column(String, nullable=False)
+    value_date = Column(Date, primary_key=True)
+    amount_minor = Column(BigInteger, nullable=False)  # see app.core.money
+    currency = Column(String(3), nullable=False)
+    type = Column(String, nullable=False)
+    status = Column(String)
+    category = Column(String)
+    subcategory = Column(String)
+    merchant_name = Column(String)
+    collected_at = Column(DateTime(timezone=True))
+    data = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_transactions_account_id_value_date", "account_id", "value_date"),
+        Index("ix_transactions_value_date_brin", "value_date", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (value_date)"},
+    )
+
+class TransactionSyncCursor(Base):
+    """Per-account position of the incremental Belvo sync"""
+
+    __tablename__ = "transaction_sync_cursors"
+
+    account_id = Column(String, primary_key=True)
+    link_id = Column(String, nullable=False, index=True)
+    last_collected_at = Column(DateTime(timezone=True))
+    synced_at = Column(DateTime(timezone=True))
+
+class TransactionDailyRollup(Base):
+    """Income/expense totals of one account for one value_date"""
+
+    __tablename__ = "transaction_daily_rollups"
+
+    account_id = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    currency = Column(String(3), nullable=False)
+    income_minor = Column(BigInteger, nullable=False)
+    expenses_minor = Column(BigInteger, nullable=False)
+    transaction_count = Column(Integer, nullable=False)
+
+class AccountKPI(Base):
+    """All-time totals of one account, folded from its daily rollups"""
+
+    __tablename__ = "account_kpis"
+
+    account_id = Column(String, primary_key=True)
+    currency = Column(String(3))
+    total_income_minor = Column(BigInteger, nullable=False)
+    total_expenses_minor = Column(BigInteger, nullable=False)
+    transaction_count = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,8 +1,6 @@
 from datetime import datetime
 from sqlalchemy import Column, Integer, String, DateTime, Boolean
-from sqlalchemy.ext.declarative import declarative_base
-
-Base = declarative_base()
+from app.db.models.base import Base
 
 class User(Base):
     """User model for authentication and profile"""
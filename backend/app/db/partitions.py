@@ -0,0 +1,103 @@
+"""
+Monthly range partitions of the `transactions` table (partitioned by value_date).
+
+Partitions are created on demand before rows are written and dropped
+wholesale once they fall out of the retention window
+(TRANSACTIONS_RETENTION_MONTHS, see TransactionRepository.prune).
+"""
+from typing import Dict, Iterable, List
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from app.core.config import settings
+
+PARENT_TABLE = "transactions"
+
+# Partitions this process has seen exist, so most writes skip the catalog lookup
+_known_partitions: set[str] = set()
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def retention_cutoff(today: date) -> date:
+    """First day of the oldest month kept"""
+    months = today.year * 12 + today.month - 1 - settings.TRANSACTIONS_RETENTION_MONTHS
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+async def ensure_partitions(engine: AsyncEngine, days: Iterable[date]):
+    """
+    Create the monthly partitions covering `days` if they don't exist yet.
+
+    Runs in its own short transaction on `engine`, not the caller's: a
+    partition is created on its own and then attached, which only takes a
+    SHARE UPDATE EXCLUSIVE lock on the parent, and that lock is released on
+    commit instead of being held while the caller keeps writing.
+    """
+    months = {partition_name(month): month for month in {month_start(day) for day in days if day}}
+    months = {name: month for name, month in months.items() if name not in _known_partitions}
+    if not months:
+        return
+    async with engine.begin() as conn:
+        missing = await _missing(conn, months)
+        if missing:
+            # Serialize partition DDL across workers, then look again
+            await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": PARENT_TABLE})
+            missing = await _missing(conn, months)
+        for name in missing:
+            month = months[name]
+            await conn.execute(text(
+                f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            ))
+            await conn.execute(text(
+                f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+            ))
+    _known_partitions.update(months)
+
+
+async def _missing(conn: AsyncConnection, months: Dict[str, date]) -> List[str]:
+    result = await conn.execute(
+        text("SELECT relname FROM pg_class WHERE relname = ANY(:names)"),
+        {"names": list(months)}
+    )
+    existing = set(result.scalars())
+    return sorted(name for name in months if name not in existing)
+
+
+async def list_partitions(conn: AsyncConnection) -> List[str]:
+    """Names of the existing partitions, oldest first"""
+    result = await conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+        "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+        "WHERE parent.relname = :parent ORDER BY child.relname"
+    ), {"parent": PARENT_TABLE})
+    return list(result.scalars())
+
+
+async def drop_partitions_before(conn: AsyncConnection, cutoff: date) -> List[str]:
+    """Detach and drop every partition whose whole month is older than `cutoff`"""
+    dropped = []
+    prefix = f"{PARENT_TABLE}_y"
+    for name in await list_partitions(conn):
+        if not name.startswith(prefix):
+            continue
+        year, month = name[len(prefix):].split("m")
+        if next_month(date(int(year), int(month), 1)) > cutoff:
+            continue
+        await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        await conn.execute(text(f"DROP TABLE {name}"))
+        _known_partitions.discard(name)
+        dropped.append(name)
+    return dropped
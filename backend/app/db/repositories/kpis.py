@@ -0,0 +1,111 @@
+from typing import Iterable, Tuple
+from datetime import date
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.transaction import AccountKPI, TransactionDailyRollup
+
+# Rebuild the touched day buckets from `transactions` and fold the difference
+# between the new and the old buckets into the account totals, in one statement.
+# Every CTE reads the same snapshot, so `old` still sees the previous buckets.
+REFRESH_DAYS_SQL = text("""
+    WITH new AS (
+        SELECT
+            account_id,
+            value_date AS day,
+            max(currency) AS currency,
+            coalesce(sum(amount_minor) FILTER (WHERE type = 'INFLOW'), 0)::bigint AS income_minor,
+            coalesce(sum(amount_minor) FILTER (WHERE type <> 'INFLOW'), 0)::bigint AS expenses_minor,
+            count(*) AS transaction_count
+        FROM transactions
+        WHERE account_id = :account_id AND value_date = ANY(:days)
+        GROUP BY account_id, value_date
+    ), old AS (
+        SELECT day, income_minor, expenses_minor, transaction_count
+        FROM transaction_daily_rollups
+        WHERE account_id = :account_id AND day = ANY(:days)
+    ), upserted AS (
+        INSERT INTO transaction_daily_rollups
+            (account_id, day, currency, income_minor, expenses_minor, transaction_count)
+        SELECT account_id, day, currency, income_minor, expenses_minor, transaction_count FROM new
+        ON CONFLICT (account_id, day) DO UPDATE SET
+            currency = EXCLUDED.currency,
+            income_minor = EXCLUDED.income_minor,
+            expenses_minor = EXCLUDED.expenses_minor,
+            transaction_count = EXCLUDED.transaction_count
+    ), emptied AS (
+        DELETE FROM transaction_daily_rollups
+        WHERE account_id = :account_id AND day = ANY(:days) AND day NOT IN (SELECT day FROM new)
+    )
+    INSERT INTO account_kpis
+        (account_id, currency, total_income_minor, total_expenses_minor, transaction_count, updated_at)
+    SELECT
+        :account_id,
+        (SELECT max(currency) FROM new),
+        (SELECT coalesce(sum(income_minor), 0) FROM new) - (SELECT coalesce(sum(income_minor), 0) FROM old),
+        (SELECT coalesce(sum(expenses_minor), 0) FROM new) - (SELECT coalesce(sum(expenses_minor), 0) FROM old),
+        (SELECT coalesce(sum(transaction_count), 0) FROM new) - (SELECT coalesce(sum(transaction_count), 0) FROM old),
+        now() AT TIME ZONE 'utc'
+    ON CONFLICT (account_id) DO UPDATE SET
+        currency = coalesce(EXCLUDED.currency, account_kpis.currency),
+        total_income_minor = account_kpis.total_income_minor + EXCLUDED.total_income_minor,
+        total_expenses_minor = account_kpis.total_expenses_minor + EXCLUDED.total_expenses_minor,
+        transaction_count = account_kpis.transaction_count + EXCLUDED.transaction_count,
+        updated_at = EXCLUDED.updated_at
+""")
+
+# Drop the day buckets before a cutoff and take them out of the account totals
+FORGET_DAYS_SQL = text("""
+    WITH forgotten AS (
+        DELETE FROM transaction_daily_rollups
+        WHERE day < :cutoff
+        RETURNING account_id, income_minor, expenses_minor, transaction_count
+    ), totals AS (
+        SELECT
+            account_id,
+            sum(income_minor)::bigint AS income_minor,
+            sum(expenses_minor)::bigint AS expenses_minor,
+            sum(transaction_count)::bigint AS transaction_count
+        FROM forgotten
+        GROUP BY account_id
+    )
+    UPDATE account_kpis SET
+        total_income_minor = account_kpis.total_income_minor - totals.income_minor,
+        total_expenses_minor = account_kpis.total_expenses_minor - totals.expenses_minor,
+        transaction_count = account_kpis.transaction_count - totals.transaction_count,
+        updated_at = now() AT TIME ZONE 'utc'
+    FROM totals
+    WHERE account_kpis.account_id = totals.account_id
+""")
+
+class KPIRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def refresh_days(self, account_id: str, days: Iterable[date]):
+        """Recompute the rollups of the given days after their transactions changed"""
+        days = sorted(set(days))
+        if days:
+            await self.session.execute(REFRESH_DAYS_SQL, {"account_id": account_id, "days": days})
+
+    async def forget_before(self, cutoff: date):
+        """Drop the rollups of every day before `cutoff`, once its transactions are gone"""
+        await self.session.execute(FORGET_DAYS_SQL, {"cutoff": cutoff})
+
+    async def get_account(self, account_id: str) -> AccountKPI | None:
+        """All-time totals of an account"""
+        return await self.session.get(AccountKPI, account_id)
+
+    async def sum_days(self, account_id: str, date_from: str | None = None,
+                       date_to: str | None = None) -> Tuple[str | None, int, int]:
+        """Currency, income and expenses (minor units) of an account between two days, inclusive"""
+        query = select(
+            func.max(TransactionDailyRollup.currency),
+            func.coalesce(func.sum(TransactionDailyRollup.income_minor), 0),
+            func.coalesce(func.sum(TransactionDailyRollup.expenses_minor), 0),
+        ).where(TransactionDailyRollup.account_id == account_id)
+        if date_from:
+            query = query.where(TransactionDailyRollup.day >= date.fromisoformat(date_from[:10]))
+        if date_to:
+            query = query.where(TransactionDailyRollup.day <= date.fromisoformat(date_to[:10]))
+        currency, income, expenses = (await self.session.execute(query)).one()
+        return currency, int(income), int(expenses)
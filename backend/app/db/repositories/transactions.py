@@ -0,0 +1,204 @@
+from typing import AsyncIterator, Dict, Iterable, List, Tuple
+from datetime import date, datetime
+import orjson
+from sqlalchemy import func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.money import to_minor
+from app.db.models.transaction import Transaction, TransactionSyncCursor
+from app.db.partitions import drop_partitions_before, ensure_partitions, retention_cutoff
+from app.db.repositories.kpis import KPIRepository
+
+COPY_COLUMNS = (
+    "id", "link_id", "account_id", "value_date", "amount_minor", "currency", "type",
+    "status", "category", "subcategory", "merchant_name", "collected_at", "data",
+    "created_at", "updated_at"
+)
+UPDATE_COLUMNS = (
+    "amount_minor", "currency", "type", "status", "category", "subcategory",
+    "merchant_name", "collected_at", "data", "updated_at"
+)
+
+# Per-connection staging table the COPY lands in, emptied on commit
+STAGING_TABLE = "transactions_staging"
+CREATE_STAGING_SQL = text(
+    f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+    f"(LIKE transactions INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+)
+TRUNCATE_STAGING_SQL = text(f"TRUNCATE {STAGING_TABLE}")
+# Autovacuum never sees temp tables, without stats the planner guesses badly
+ANALYZE_STAGING_SQL = text(f"ANALYZE {STAGING_TABLE}")
+
+# Rows live in the partition of their value_date, a transaction whose date moved
+# is re-inserted elsewhere, so its old copy has to go
+DELETE_MOVED_SQL = text(
+    f"DELETE FROM transactions t USING {STAGING_TABLE} s "
+    f"WHERE t.account_id = :account_id AND t.id = s.id AND t.value_date <> s.value_date "
+    f"RETURNING t.value_date"
+)
+
+MERGE_STAGING_SQL = text(
+    f"INSERT INTO transactions ({', '.join(COPY_COLUMNS)}) "
+    f"SELECT DISTINCT ON (id, value_date) {', '.join(COPY_COLUMNS)} FROM {STAGING_TABLE} "
+    f"ORDER BY id, value_date "
+    f"ON CONFLICT (id, value_date) DO UPDATE SET "
+    + ", ".join(f"{column} = EXCLUDED.{column}" for column in UPDATE_COLUMNS)
+    # Overlapping syncs mostly resend unchanged rows, skip rewriting those
+    + " WHERE transactions.data IS DISTINCT FROM EXCLUDED.data"
+    + " RETURNING value_date"
+)
+
+def _parse_date(value: str | None) -> date | None:
+    return date.fromisoformat(value[:10]) if value else None
+
+def _parse_datetime(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+def to_record(link_id: str, account_id: str, transaction: Dict, now: datetime) -> tuple:
+    """Map a Belvo transaction to a COPY record in `COPY_COLUMNS` order"""
+    merchant = transaction.get("merchant") or {}
+    return (
+        transaction["id"],
+        link_id,
+        account_id,
+        _parse_date(transaction["value_date"]),
+        to_minor(transaction["amount"], transaction["currency"]),
+        transaction["currency"],
+        transaction["type"],
+        transaction.get("status"),
+        transaction.get("category"),
+        transaction.get("subcategory"),
+        merchant.get("merchant_name"),
+        _parse_datetime(transaction.get("collected_at")),
+        orjson.dumps(transaction).decode(),
+        now,
+        now,
+    )
+
+class TransactionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def upsert_many(self, link_id: str, account_id: str, transactions: Iterable[Dict]) -> int:
+        """
+        Insert or update transactions by Belvo id, returns the number of rows.
+
+        Rows are COPY'd into a temporary staging table in binary format and
+        merged into `transactions` with a single INSERT ... ON CONFLICT. The
+        KPI rollups of the days whose rows actually changed are refreshed in
+        the same transaction.
+        """
+        now = datetime.utcnow()
+        cutoff = retention_cutoff(now.date())
+        records = [to_record(link_id, account_id, transaction, now) for transaction in transactions]
+        # Months past retention are pruned, rows for them are not stored again
+        records = [record for record in records if record[3] >= cutoff]
+        if not records:
+            return 0
+        # Own transaction: partition DDL must not hold locks for the rest of this one
+        await ensure_partitions(self.session.bind, (record[3] for record in records))
+        connection = await self.session.connection()
+        await connection.execute(CREATE_STAGING_SQL)
+        await connection.execute(TRUNCATE_STAGING_SQL)
+
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=COPY_COLUMNS
+        )
+
+        await connection.execute(ANALYZE_STAGING_SQL)
+        moved = await connection.execute(DELETE_MOVED_SQL, {"account_id": account_id})
+        changed = await connection.execute(MERGE_STAGING_SQL)
+        await KPIRepository(self.session).refresh_days(
+            account_id, [*moved.scalars(), *changed.scalars()]
+        )
+        return len(records)
+
+    def _account_query(self, account_id: str, date_from: str | None, date_to: str | None):
+        query = select(Transaction.data).where(Transaction.account_id == account_id)
+        if date_from:
+            query = query.where(Transaction.value_date >= _parse_date(date_from))
+        if date_to:
+            query = query.where(Transaction.value_date <= _parse_date(date_to))
+        return query.order_by(Transaction.value_date.desc(), Transaction.id)
+
+    async def list_by_account(self, account_id: str, date_from: str | None = None,
+                              date_to: str | None = None) -> List[Dict]:
+        """Stored transactions of an account, newest first"""
+        result = await self.session.execute(self._account_query(account_id, date_from, date_to))
+        return list(result.scalars())
+
+    async def iter_by_account(self, account_id: str, date_from: str | None = None,
+                              date_to: str | None = None,
+                              batch_size: int = 1000) -> AsyncIterator[Dict]:
+        """Like `list_by_account`, streamed through a server-side cursor"""
+        query = self._account_query(account_id, date_from, date_to).execution_options(
+            yield_per=batch_size
+        )
+        result = await self.session.stream_scalars(query)
+        async for data in result:
+            yield data
+
+    async def columns_by_account(self, account_id: str) -> Tuple[str | None, Dict[str, list]]:
+        """
+        Currency and analytics columns of an account, one array per column so
+        the driver decodes them in bulk instead of building a row per transaction
+        """
+        query = select(
+            func.max(Transaction.currency).label("currency"),
+            func.array_agg(Transaction.value_date - literal(date(1970, 1, 1))).label("epoch_day"),
+            func.array_agg(Transaction.amount_minor).label("amount_minor"),
+            func.array_agg(Transaction.type == "INFLOW").label("inflow"),
+            func.array_agg(func.coalesce(Transaction.category, "")).label("category"),
+            func.array_agg(func.coalesce(Transaction.subcategory, "")).label("subcategory"),
+            func.array_agg(func.coalesce(Transaction.merchant_name, "")).label("merchant_name"),
+        ).where(Transaction.account_id == account_id)
+        columns = dict((await self.session.execute(query)).one()._mapping)
+        currency = columns.pop("currency")
+        return currency, {name: values or [] for name, values in columns.items()}
+
+    async def prune(self, today: date) -> List[str]:
+        """
+        Drop the monthly partitions past the retention window, and the KPI
+        rollups of their days, in the session's transaction. Returns the
+        partitions dropped.
+        """
+        cutoff = retention_cutoff(today)
+        connection = await self.session.connection()
+        dropped = await drop_partitions_before(connection, cutoff)
+        # Every row before the cutoff lived in a dropped partition
+        await KPIRepository(self.session).forget_before(cutoff)
+        return dropped
+
+    async def get_cursor(self, account_id: str) -> TransactionSyncCursor | None:
+        """Sync cursor of an account"""
+        return await self.session.get(TransactionSyncCursor, account_id)
+
+    async def synced_accounts(self) -> Dict[str, List[str]]:
+        """Accounts that have been synced at least once, by link"""
+        result = await self.session.execute(
+            select(TransactionSyncCursor.link_id, TransactionSyncCursor.account_id)
+        )
+        accounts: Dict[str, List[str]] = {}
+        for link_id, account_id in result:
+            accounts.setdefault(link_id, []).append(account_id)
+        return accounts
+
+    async def save_cursor(self, account_id: str, link_id: str,
+                          last_collected_at: datetime | None, synced_at: datetime):
+        """Move the sync cursor forward"""
+        statement = insert(TransactionSyncCursor).values(
+            account_id=account_id,
+            link_id=link_id,
+            last_collected_at=last_collected_at,
+            synced_at=synced_at
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[TransactionSyncCursor.account_id],
+            set_={
+                "link_id": statement.excluded.link_id,
+                "last_collected_at": statement.excluded.last_collected_at,
+                "synced_at": statement.excluded.synced_at,
+            }
+        )
+        await self.session.execute(statement)
@@ -1,7 +1,8 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.user import User
-from app.core.security import get_password_hash, verify_password
+from app.core.passwords import get_password_hasher
+from app.core.principals import invalidate_principal
 
 class UserRepository:
     def __init__(self, session: AsyncSession):
@@ -16,7 +17,7 @@ class UserRepository:
         """Create new user"""
         db_user = User(
             email=email,
-            hashed_password=get_password_hash(password),
+            hashed_password=await get_password_hasher().hash(password),
             username=username
         )
         self.session.add(db_user)
@@ -29,8 +30,20 @@ class UserRepository:
         user = await self.get_by_email(email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await get_password_hasher().verify(password, user.hashed_password)
+        if not valid:
             return None
+        if new_hash:
+            # Stored with another cost factor, upgrade it while we have the password
+            await self.update(user, hashed_password=new_hash)
+        return user
+
+    async def update(self, user: User, **values) -> User:
+        """Change a user and drop its cached principal"""
+        for field, value in values.items():
+            setattr(user, field, value)
+        await self.session.commit()
+        await invalidate_principal(user.id)
         return user
 
     async def get_by_id(self, id: int) -> User | None:
@@ -0,0 +1,182 @@
+from typing import Any, Dict, List
+import logging
+import secrets
+import time
+import orjson
+from redis import asyncio as aioredis
+from redis.exceptions import ResponseError
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Move the retries that are due from the delayed set back to the stream, atomically
+PROMOTE_DELAYED_SCRIPT = """
+local due = redis.call("zrangebyscore", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+for _, job in ipairs(due) do
+    redis.call("xadd", KEYS[2], "MAXLEN", "~", ARGV[3], "*", "job", job)
+    redis.call("zrem", KEYS[1], job)
+end
+return #due
+"""
+
+class Job:
+    """A job as read from the stream"""
+
+    def __init__(self, message_id: bytes, payload: bytes):
+        self.message_id = message_id
+        self.payload = payload
+        job = orjson.loads(payload)
+        self.id: str = job["id"]
+        self.name: str = job["name"]
+        self.kwargs: Dict[str, Any] = job["kwargs"]
+        self.attempts: int = job["attempts"]
+
+    def __repr__(self) -> str:
+        return f"Job({self.name}, {self.kwargs}, attempts={self.attempts})"
+
+def _encode(name: str, kwargs: Dict[str, Any], attempts: int = 0, job_id: str | None = None) -> bytes:
+    return orjson.dumps({
+        "id": job_id or secrets.token_hex(8),
+        "name": name,
+        "kwargs": kwargs,
+        "attempts": attempts,
+    })
+
+class JobQueue:
+    """
+    Jobs on a Redis Stream read through a consumer group.
+
+    Each job goes to one consumer and stays pending until it is acked. Failed
+    jobs wait in a sorted set (scored by when they are due) and go back on the
+    stream with exponential backoff, until JOBS_MAX_ATTEMPTS sends them to the
+    dead-letter stream. Jobs left pending by a dead worker are claimed by
+    another one after JOBS_VISIBILITY_TIMEOUT.
+    """
+
+    def __init__(self, redis: aioredis.Redis | None = None):
+        self._redis = redis
+        self.stream = settings.JOBS_STREAM
+        self.group = settings.JOBS_GROUP
+        self.delayed = settings.JOBS_DELAYED_KEY
+        self.dead_letter = settings.JOBS_DEAD_LETTER_STREAM
+
+    @property
+    def redis(self) -> aioredis.Redis:
+        return self._redis or get_redis()
+
+    async def enqueue(self, name: str, kwargs: Dict[str, Any] | None = None,
+                      unique_for: int | None = None) -> bool:
+        """
+        Add a job. With `unique_for`, the same job (name and kwargs) is only
+        added once in that many seconds. Returns whether it was added.
+        """
+        kwargs = kwargs or {}
+        if unique_for:
+            arguments = orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS).decode()
+            unique_key = f"{settings.REDIS_LOCK_KEY_PREFIX}job:{name}:{arguments}"
+            if not await self.redis.set(unique_key, 1, nx=True, ex=unique_for):
+                return False
+        await self.redis.xadd(
+            self.stream, {"job": _encode(name, kwargs)},
+            maxlen=settings.JOBS_STREAM_MAX_LEN, approximate=True
+        )
+        return True
+
+    async def ensure_group(self):
+        """Create the stream and its consumer group if they do not exist yet"""
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read(self, consumer: str, count: int, block_ms: int) -> List[Job]:
+        """
+        Up to `count` jobs for this consumer: due retries are put back on the
+        stream first, then stale pending jobs are claimed, then new ones read
+        (blocking up to `block_ms`)
+        """
+        await self.redis.eval(
+            PROMOTE_DELAYED_SCRIPT, 2, self.delayed, self.stream,
+            time.time(), count, settings.JOBS_STREAM_MAX_LEN
+        )
+
+        _, claimed, *_ = await self.redis.xautoclaim(
+            self.stream, self.group, consumer,
+            min_idle_time=settings.JOBS_VISIBILITY_TIMEOUT * 1000, count=count
+        )
+        jobs = self._parse(claimed)
+        if jobs:
+            return jobs
+
+        response = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream: ">"}, count=count, block=block_ms
+        )
+        return [job for _, messages in response for job in self._parse(messages)]
+
+    def _parse(self, messages) -> List[Job]:
+        jobs = []
+        for message_id, fields in messages:
+            # Claimed ids of entries trimmed from the stream come back without fields
+            if fields and b"job" in fields:
+                jobs.append(Job(message_id, fields[b"job"]))
+        return jobs
+
+    async def touch(self, job: Job, consumer: str):
+        """
+        Reset the idle time of a job this consumer holds, so it is not claimed
+        by another one while it waits here
+        """
+        await self.redis.xclaim(
+            self.stream, self.group, consumer, min_idle_time=0,
+            message_ids=[job.message_id], justid=True
+        )
+
+    async def ack(self, job: Job):
+        """Mark a job as done"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self.stream, self.group, job.message_id)
+            pipe.xdel(self.stream, job.message_id)
+            await pipe.execute()
+
+    async def retry(self, job: Job, error: str, retryable: bool = True):
+        """Schedule a failed job again, or dead-letter it once out of attempts"""
+        attempts = job.attempts + 1
+        async with self.redis.pipeline(transaction=True) as pipe:
+            if not retryable or attempts >= settings.JOBS_MAX_ATTEMPTS:
+                logger.error(f"{job} dead-lettered after {attempts} attempts: {error}")
+                pipe.xadd(
+                    self.dead_letter, {"job": job.payload, "error": error, "failed_at": time.time()},
+                    maxlen=settings.JOBS_STREAM_MAX_LEN, approximate=True
+                )
+            else:
+                due = time.time() + settings.JOBS_RETRY_BACKOFF * 2 ** job.attempts
+                pipe.zadd(self.delayed, {_encode(job.name, job.kwargs, attempts, job.id): due})
+            pipe.xack(self.stream, self.group, job.message_id)
+            pipe.xdel(self.stream, job.message_id)
+            await pipe.execute()
+
+    async def stats(self) -> Dict[str, Any]:
+        """Queue depth: stream length, jobs pending in the group, retries waiting, dead letters"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.xlen(self.stream)
+            pipe.xpending(self.stream, self.group)
+            pipe.zcard(self.delayed)
+            pipe.xlen(self.dead_letter)
+            length, pending, delayed, dead = await pipe.execute(raise_on_error=False)
+        return {
+            "stream": length if isinstance(length, int) else 0,
+            "pending": pending["pending"] if isinstance(pending, dict) else 0,
+            "delayed": delayed if isinstance(delayed, int) else 0,
+            "dead_letter": dead if isinstance(dead, int) else 0,
+        }
+
+_queue: JobQueue | None = None
+
+def get_job_queue() -> JobQueue:
+    """Worker-wide job queue on the shared Redis client"""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+    return _queue
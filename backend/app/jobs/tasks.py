@@ -0,0 +1,69 @@
+from typing import Awaitable, Callable, Dict, Sequence
+from datetime import date
+import logging
+from app.core.config import settings
+from app.db.repositories.transactions import TransactionRepository
+from app.db.session import AsyncSessionLocal
+from app.jobs.queue import get_job_queue
+from app.services.belvo_service import LINK_RESOURCES, get_belvo_service
+
+logger = logging.getLogger(__name__)
+
+class JobSpec:
+    """A job handler and how many of its jobs may run at once in one worker"""
+
+    def __init__(self, handler: Callable[..., Awaitable], concurrency: int | None = None):
+        self.handler = handler
+        self.concurrency = concurrency
+
+JOBS: Dict[str, JobSpec] = {}
+
+# Jobs the worker enqueues on its own, every so many seconds
+PERIODIC_JOBS: Dict[str, int] = {
+    "refresh_links": settings.LINK_REFRESH_SCHEDULE_INTERVAL,
+    "prune_transactions": settings.TRANSACTIONS_PRUNE_INTERVAL,
+}
+
+def job(name: str, concurrency: int | None = None):
+    """Register a job handler under `name`"""
+    def register(handler: Callable[..., Awaitable]):
+        JOBS[name] = JobSpec(handler, concurrency)
+        return handler
+    return register
+
+@job("warm_link", concurrency=settings.JOBS_SCRAPE_CONCURRENCY)
+async def warm_link(link_id: str):
+    """Scrape a new link and load its accounts and transactions into the local store"""
+    service = get_belvo_service()
+    await service.refresh_link(link_id, force=True)
+    for account in await service.get_accounts(link_id):
+        await service.sync_transactions(link_id, account["id"], force=True)
+
+@job("refresh_link", concurrency=settings.JOBS_SCRAPE_CONCURRENCY)
+async def refresh_link(link_id: str, resources: Sequence[str] = LINK_RESOURCES,
+                       account_ids: Sequence[str] = ()):
+    """Re-scrape the link's stale resources (per its refresh policy)"""
+    await get_belvo_service().refresh_link(link_id, resources, account_ids)
+
+@job("refresh_links")
+async def refresh_links():
+    """Queue a refresh of every link with synced accounts"""
+    async with AsyncSessionLocal() as session:
+        links = await TransactionRepository(session).synced_accounts()
+
+    queue = get_job_queue()
+    for link_id, account_ids in links.items():
+        await queue.enqueue(
+            "refresh_link",
+            {"link_id": link_id, "account_ids": account_ids},
+            unique_for=settings.LINK_REFRESH_SCHEDULE_INTERVAL
+        )
+
+@job("prune_transactions")
+async def prune_transactions():
+    """Drop the transaction months past TRANSACTIONS_RETENTION_MONTHS and their KPI rollups"""
+    async with AsyncSessionLocal() as session:
+        dropped = await TransactionRepository(session).prune(date.today())
+        await session.commit()
+    if dropped:
+        logger.info(f"Dropped transaction partitions {', '.join(dropped)}")
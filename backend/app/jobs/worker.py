@@ -0,0 +1,149 @@
+"""
+Job worker, run next to the API as its own process:
+
+    poetry run python -m app.jobs.worker
+
+Reads jobs from the Redis Stream through the consumer group (see
+app.jobs.queue), at most JOBS_CONCURRENCY at a time and never more than a
+job's own cap for each kind, and enqueues the periodic jobs.
+"""
+from typing import Dict
+import asyncio
+import logging
+import os
+import signal
+import socket
+from redis.exceptions import RedisError
+from app.core.cache import close_cache, init_cache
+from app.core.config import settings
+from app.core.redis import close_redis, init_redis
+from app.jobs.queue import Job, JobQueue, get_job_queue
+from app.jobs.tasks import JOBS, PERIODIC_JOBS, JobSpec
+from app.services.http_client import close_belvo_client, init_belvo_client
+
+logger = logging.getLogger(__name__)
+
+class Worker:
+    """Runs queued jobs until stopped"""
+
+    def __init__(self, queue: JobQueue, jobs: Dict[str, JobSpec],
+                 concurrency: int = settings.JOBS_CONCURRENCY, consumer: str | None = None):
+        self.queue = queue
+        self.jobs = jobs
+        self.concurrency = concurrency
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self._limits = {
+            name: asyncio.Semaphore(spec.concurrency)
+            for name, spec in jobs.items() if spec.concurrency
+        }
+        self._running: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop reading new jobs; the running ones are given time to finish"""
+        self._stopping.set()
+
+    async def run(self):
+        await self.queue.ensure_group()
+        scheduler = asyncio.create_task(self._schedule())
+        logger.info(f"Worker {self.consumer} started")
+        try:
+            while not self._stopping.is_set():
+                free = self.concurrency - len(self._running)
+                if free <= 0:
+                    await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                try:
+                    jobs = await self.queue.read(self.consumer, free, settings.JOBS_BLOCK_MS)
+                except RedisError as e:
+                    logger.warning(f"Reading jobs failed: {e}")
+                    await asyncio.sleep(1)
+                    continue
+
+                for job in jobs:
+                    task = asyncio.create_task(self._execute(job))
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+        finally:
+            scheduler.cancel()
+            # Unfinished jobs stay pending and are claimed again later
+            if self._running:
+                await asyncio.wait(self._running, timeout=settings.JOBS_SHUTDOWN_TIMEOUT)
+            logger.info(f"Worker {self.consumer} stopped")
+
+    async def _execute(self, job: Job):
+        spec = self.jobs.get(job.name)
+        try:
+            if spec is None:
+                await self.queue.retry(job, f"Unknown job {job.name}", retryable=False)
+                return
+
+            limit = self._limits.get(job.name)
+            if limit:
+                await self._wait_for_slot(limit, job)
+            try:
+                await asyncio.wait_for(spec.handler(**job.kwargs), settings.JOBS_TIMEOUT)
+            except Exception as e:
+                logger.warning(f"{job} failed: {e!r}")
+                await self.queue.retry(job, repr(e))
+                return
+            finally:
+                if limit:
+                    limit.release()
+            await self.queue.ack(job)
+        except RedisError as e:
+            logger.warning(f"Could not settle {job}, it will be claimed again: {e}")
+
+    async def _wait_for_slot(self, limit: asyncio.Semaphore, job: Job):
+        """
+        Take a slot of the job's kind. A job read from the stream is already
+        pending on this consumer, so while it waits it is claimed again every
+        so often: its idle time never reaches JOBS_VISIBILITY_TIMEOUT and no
+        other worker takes it over.
+        """
+        if not limit.locked():
+            await limit.acquire()
+            return
+        while True:
+            try:
+                await asyncio.wait_for(limit.acquire(), settings.JOBS_VISIBILITY_TIMEOUT / 3)
+                break
+            except asyncio.TimeoutError:
+                await self.queue.touch(job, self.consumer)
+        try:
+            # The run starts with a fresh idle time, and JOBS_TIMEOUT is shorter
+            # than the visibility timeout
+            await self.queue.touch(job, self.consumer)
+        except BaseException:
+            limit.release()
+            raise
+
+    async def _schedule(self):
+        """Enqueue periodic jobs; the unique window makes one process win each period"""
+        while True:
+            for name, interval in PERIODIC_JOBS.items():
+                try:
+                    await self.queue.enqueue(name, unique_for=interval)
+                except RedisError as e:
+                    logger.warning(f"Scheduling {name} failed: {e}")
+            await asyncio.sleep(settings.JOBS_SCHEDULER_TICK)
+
+async def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    init_redis()
+    init_cache()
+    init_belvo_client()
+    worker = Worker(get_job_queue(), JOBS)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await close_belvo_client()
+        await close_cache()
+        await close_redis()
+
+if __name__ == "__main__":
+    asyncio.run(main())
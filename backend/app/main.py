@@ -1,20 +1,45 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.db.init_db import init_db
-from app.api.v1 import auth, users, banks
+from app.api.v1 import auth, users, banks, metrics
 from app.api.middleware.auth import AuthMiddleware
 from app.api.middleware.cache import CacheMiddleware
 from app.api.middleware.error import ErrorMiddleware
+from app.core.redis import init_redis, close_redis
+from app.core.cache import init_cache, close_cache
+from app.services.http_client import init_belvo_client, close_belvo_client
+from app.core.passwords import init_password_hasher, close_password_hasher
+from app.core.revocations import init_revocation_filter, close_revocation_filter
 import logging
 
 # Configurar logging
 logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create and release worker-wide resources"""
+    await init_db()
+    init_redis()
+    init_cache()
+    init_belvo_client()
+    init_password_hasher()
+    init_revocation_filter()
+    try:
+        yield
+    finally:
+        await close_revocation_filter()
+        close_password_hasher()
+        await close_belvo_client()
+        await close_cache()
+        await close_redis()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Middleware configuration
@@ -32,11 +57,8 @@ app.add_middleware(CacheMiddleware)
 app.add_middleware(AuthMiddleware)
 app.add_middleware(ErrorMiddleware)
 
-@app.on_event("startup")
-async def startup_event():
-    await init_db()
-
 # Include routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["auth"])
 app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users", tags=["users"])
 app.include_router(banks.router, prefix=f"{settings.API_V1_STR}/banks", tags=["banks"])
+app.include_router(metrics.router, prefix=f"{settings.API_V1_STR}/metrics", tags=["metrics"])
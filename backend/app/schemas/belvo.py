@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
 
 class Institution(BaseModel):
     name: str
@@ -125,4 +125,36 @@ class LinkResponse(BaseModel):
 class TransactionResponse(BaseModel):
     transactions: List[Transaction]
     kpi: CalculatedKPI
-    account_info: Account 
\ No newline at end of file
+    account_info: Account 
+
+class TransactionStreamSummary(BaseModel):
+    """Trailer record of the NDJSON transactions stream"""
+    kpi: CalculatedKPI
+    account_info: Account
+
+class CashFlowBucket(BaseModel):
+    """Income and expenses of one day, week (starting Monday) or month"""
+    period: date
+    income: Decimal
+    expenses: Decimal
+    net: Decimal
+    transaction_count: int
+
+class CategoryCashFlow(BaseModel):
+    category: Optional[str] = None
+    subcategory: Optional[str] = None
+    income: Decimal
+    expenses: Decimal
+    transaction_count: int
+
+class MerchantSpend(BaseModel):
+    merchant_name: str
+    expenses: Decimal
+    transaction_count: int
+
+class CashFlowAnalytics(BaseModel):
+    granularity: Literal["daily", "weekly", "monthly"]
+    currency: Optional[str] = None
+    buckets: List[CashFlowBucket]
+    categories: List[CategoryCashFlow]
+    top_merchants: List[MerchantSpend]
@@ -0,0 +1,169 @@
+"""
+Cash-flow analytics computed over columnar NumPy arrays.
+
+Transactions are loaded as parallel arrays (epoch day, amount in minor units,
+inflow flag, dictionary-encoded category/subcategory/merchant) and every
+breakdown is a group-by done with np.bincount over dense int codes, with no
+per-row Python and no sorting.
+"""
+from typing import List, Sequence, Tuple
+from datetime import date
+import copy
+import numpy as np
+from app.core.money import to_decimal
+from app.schemas.belvo import CashFlowAnalytics, CashFlowBucket, CategoryCashFlow, MerchantSpend
+
+EPOCH = date(1970, 1, 1)
+
+def _encode(values: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    """Dictionary-encode strings: (distinct values, code of each value)"""
+    names = list(dict.fromkeys(values))
+    codes = {name: code for code, name in enumerate(names)}
+    return names, np.fromiter(map(codes.__getitem__, values), dtype=np.int64, count=len(values))
+
+def _epoch_day(value: str) -> int:
+    return (date.fromisoformat(value[:10]) - EPOCH).days
+
+class TransactionColumns:
+    """Transactions of one account as parallel arrays"""
+
+    ROW_ARRAYS = ("epoch_day", "income", "expenses", "category", "subcategory", "merchant")
+
+    def __init__(self, currency: str | None, epoch_day: Sequence[int], amount_minor: Sequence[int],
+                 inflow: Sequence[bool], category: Sequence[str], subcategory: Sequence[str],
+                 merchant_name: Sequence[str]):
+        self.currency = currency
+        self.epoch_day = np.asarray(epoch_day, dtype=np.int64)
+        amount = np.asarray(amount_minor, dtype=np.int64)
+        inflow = np.asarray(inflow, dtype=bool)
+        self.income = np.where(inflow, amount, 0)
+        self.expenses = np.where(inflow, 0, amount)
+        self.category_names, self.category = _encode(category)
+        self.subcategory_names, self.subcategory = _encode(subcategory)
+        self.merchant_names, self.merchant = _encode(merchant_name)
+
+    def __len__(self) -> int:
+        return len(self.epoch_day)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.ROW_ARRAYS)
+
+    def between(self, date_from: str | None = None, date_to: str | None = None) -> "TransactionColumns":
+        """Rows with a value_date in the range (inclusive), sharing the dictionaries"""
+        if not date_from and not date_to:
+            return self
+        mask = np.ones(len(self), dtype=bool)
+        if date_from:
+            mask &= self.epoch_day >= _epoch_day(date_from)
+        if date_to:
+            mask &= self.epoch_day <= _epoch_day(date_to)
+        subset = copy.copy(self)
+        for name in self.ROW_ARRAYS:
+            setattr(subset, name, getattr(self, name)[mask])
+        return subset
+
+def _periods(epoch_day: np.ndarray, granularity: str) -> np.ndarray:
+    """Epoch day of the start of each day's period"""
+    if granularity == "daily":
+        return epoch_day
+    if granularity == "weekly":
+        # 1970-01-01 was a Thursday
+        return epoch_day - (epoch_day + 3) % 7
+    months = epoch_day.astype("datetime64[D]").astype("datetime64[M]")
+    return months.astype("datetime64[D]").astype(np.int64)
+
+def _group(codes: np.ndarray, size: int, *weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """
+    Group by small non-negative int codes with bincount, no sorting: the
+    codes present, their row counts and the sum of each weight per code
+    """
+    counts = np.bincount(codes, minlength=size)
+    # float64 sums are exact for totals below 2**53 minor units
+    sums = [np.rint(np.bincount(codes, weights=weight, minlength=size)).astype(np.int64) for weight in weights]
+    present = np.flatnonzero(counts)
+    return present, counts[present], [total[present] for total in sums]
+
+def _group_by_period(epoch_day: np.ndarray, granularity: str, *weights: np.ndarray):
+    """Group rows by period: first per day over the account's date span, then days into periods"""
+    if not len(epoch_day):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), [np.empty(0, dtype=np.int64) for _ in weights]
+    first = epoch_day.min()
+    days, counts, sums = _group(epoch_day - first, epoch_day.max() - first + 1, *weights)
+    periods, inverse = np.unique(_periods(days + first, granularity), return_inverse=True)
+    return (
+        periods,
+        np.bincount(inverse, weights=counts, minlength=len(periods)).astype(np.int64),
+        [np.bincount(inverse, weights=total, minlength=len(periods)).astype(np.int64) for total in sums]
+    )
+
+def compute_cash_flow(columns: TransactionColumns, granularity: str = "monthly",
+                      top_merchants: int = 10) -> CashFlowAnalytics:
+    """Income vs expenses per period, per category/subcategory, and top merchants by spend"""
+    currency = columns.currency
+    money = lambda minor: to_decimal(int(minor), currency)
+
+    periods, counts, (income, expenses) = _group_by_period(
+        columns.epoch_day, granularity, columns.income, columns.expenses
+    )
+    buckets = [
+        CashFlowBucket(
+            period=period,
+            income=money(period_income),
+            expenses=money(period_expenses),
+            net=money(period_income - period_expenses),
+            transaction_count=count
+        )
+        for period, count, period_income, period_expenses in zip(
+            periods.astype("datetime64[D]").tolist(), counts.tolist(), income.tolist(), expenses.tolist()
+        )
+    ]
+
+    # One key per (category, subcategory) pair
+    radix = max(len(columns.subcategory_names), 1)
+    pairs, counts, (income, expenses) = _group(
+        columns.category * radix + columns.subcategory,
+        len(columns.category_names) * radix,
+        columns.income, columns.expenses
+    )
+    category_codes, subcategory_codes = np.divmod(pairs, radix)
+    categories = [
+        CategoryCashFlow(
+            category=columns.category_names[category] or None,
+            subcategory=columns.subcategory_names[subcategory] or None,
+            income=money(pair_income),
+            expenses=money(pair_expenses),
+            transaction_count=count
+        )
+        for category, subcategory, count, pair_income, pair_expenses in zip(
+            category_codes.tolist(), subcategory_codes.tolist(), counts.tolist(),
+            income.tolist(), expenses.tolist()
+        )
+    ]
+    categories.sort(key=lambda item: item.expenses, reverse=True)
+
+    spent = columns.expenses > 0
+    merchants, counts, (expenses,) = _group(
+        columns.merchant[spent], len(columns.merchant_names), columns.expenses[spent]
+    )
+    named = np.array([bool(columns.merchant_names[code]) for code in merchants.tolist()], dtype=bool)
+    merchants, counts, expenses = merchants[named], counts[named], expenses[named]
+    top = np.argsort(expenses, kind="stable")[::-1][:top_merchants]
+    merchant_spend = [
+        MerchantSpend(
+            merchant_name=columns.merchant_names[merchant],
+            expenses=money(spend),
+            transaction_count=count
+        )
+        for merchant, count, spend in zip(
+            merchants[top].tolist(), counts[top].tolist(), expenses[top].tolist()
+        )
+    ]
+
+    return CashFlowAnalytics(
+        granularity=granularity,
+        currency=currency,
+        buckets=buckets,
+        categories=categories,
+        top_merchants=merchant_spend
+    )
@@ -1,45 +1,40 @@
 from typing import Dict, List
 import httpx
-from app.core.config import settings
+from app.services.http_client import get_belvo_client
 
 class BelvoClient:
     """Belvo API client"""
-    
-    def __init__(self):
-        self.base_url = settings.BELVO_API_URL
-        self.auth = (settings.BELVO_SECRET_ID, settings.BELVO_SECRET_PASSWORD)
-        
+
+    def __init__(self, client: httpx.AsyncClient | None = None):
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_belvo_client()
+
     async def get_institutions(self) -> List[Dict]:
         """Get list of available institutions"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/institutions/",
-                auth=self.auth
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.get("/api/institutions/")
+        response.raise_for_status()
+        return response.json()
 
     async def get_accounts(self, link_id: str) -> List[Dict]:
         """Get accounts for a link"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/accounts/",
-                auth=self.auth,
-                params={"link": link_id}
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.client.get(
+            "/api/accounts/",
+            params={"link": link_id}
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def get_transactions(self, link_id: str, account_id: str) -> List[Dict]:
         """Get transactions for an account"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/api/transactions/",
-                auth=self.auth,
-                params={
-                    "link": link_id,
-                    "account": account_id
-                }
-            )
-            response.raise_for_status()
-            return response.json() 
\ No newline at end of file
+        response = await self.client.get(
+            "/api/transactions/",
+            params={
+                "link": link_id,
+                "account": account_id
+            }
+        )
+        response.raise_for_status()
+        return response.json()
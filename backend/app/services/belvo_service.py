@@ -1,103 +1,197 @@
-from typing import Dict, List, Any
+from typing import AsyncIterator, Dict, List, Any, Sequence, Tuple
+from collections import deque
 from fastapi import HTTPException
+import asyncio
 import httpx
-import json
+import logging
+import math
+import time
 from redis import asyncio as aioredis
+from app.core import codec
 from app.core.config import settings
+from app.core.redis import get_redis
 from functools import lru_cache
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from .link_factory import LinkPayloadFactory
+from app.core.cache import LRUCache, TwoTierCache, get_cache
+from app.core.singleflight import SingleFlight
+from app.db.repositories.kpis import KPIRepository
+from app.db.repositories.transactions import TransactionRepository
+from app.schemas.belvo import CalculatedKPI, CashFlowAnalytics
+from app.services.analytics import TransactionColumns, compute_cash_flow
+from app.services.kpi import make_kpi
+from app.db.session import AsyncSessionLocal
+from app.jobs.queue import get_job_queue
+from .http_client import get_belvo_client
+
+logger = logging.getLogger(__name__)
+
+INSTITUTIONS_CACHE_KEY = "institutions:catalog"
+
+# What a link re-scrape can refresh, each tracked on its own
+LINK_RESOURCES = ("accounts", "transactions")
 
 class BelvoService:
     """Service for handling Belvo API interactions"""
     
-    def __init__(self):
-        self._auth = (settings.BELVO_SECRET_ID, settings.BELVO_SECRET_PASSWORD)
-        self._base_url = settings.BELVO_API_URL
-        self._redis = None
-
-    async def _get_redis(self):
-        if not self._redis:
-            self._redis = await aioredis.from_url(
-                f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-                encoding="utf-8",
-                decode_responses=True
-            )
-        return self._redis
+    def __init__(self, redis: aioredis.Redis | None = None, cache: TwoTierCache | None = None):
+        self._redis = redis
+        self._cache = cache
+        self._singleflight = SingleFlight(redis)
+        self._background_tasks: set[asyncio.Task] = set()
+        self._columns = LRUCache(
+            settings.ANALYTICS_COLUMNS_MAX_ENTRIES, settings.ANALYTICS_COLUMNS_MAX_BYTES
+        )
+
+    @property
+    def redis(self) -> aioredis.Redis:
+        return self._redis or get_redis()
+
+    @property
+    def cache(self) -> TwoTierCache:
+        return self._cache or get_cache()
 
     async def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict:
         """Make authenticated request to Belvo API"""
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"{self._base_url}/api/{endpoint}"
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    auth=self._auth,
-                    **kwargs
+            client = get_belvo_client()
+            response = await client.request(
+                method=method,
+                url=f"/api/{endpoint}",
+                **kwargs
+            )
+            
+            if response.status_code >= 400:
+                error_data = response.json()
+                if isinstance(error_data, list):
+                    error_detail = error_data[0].get('message', str(error_data))
+                else:
+                    error_detail = error_data.get('detail', str(error_data))
+                raise HTTPException(
+                    status_code=response.status_code,
+                    detail=error_detail
                 )
                 
-                if response.status_code >= 400:
-                    error_data = response.json()
-                    if isinstance(error_data, list):
-                        error_detail = error_data[0].get('message', str(error_data))
-                    else:
-                        error_detail = error_data.get('detail', str(error_data))
-                    raise HTTPException(
-                        status_code=response.status_code,
-                        detail=error_detail
-                    )
-                    
-                return response.json()
+            return response.json()
         except httpx.HTTPError as e:
             raise HTTPException(status_code=500, detail=str(e))
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    def _spawn(self, coro):
+        """Run a coroutine in the background, keeping a reference until it ends"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
     async def get_institutions(self) -> List[Dict]:
-        """Get list of available institutions"""
+        """
+        Get list of available institutions (stale-while-revalidate).
+
+        Entries older than INSTITUTIONS_SOFT_TTL are served immediately while
+        a background task refreshes them; Redis drops them after
+        INSTITUTIONS_HARD_TTL, which bounds how long we ride out a Belvo outage.
+        """
         try:
-            response = await self._make_request("GET", "institutions/")
+            entry = await self._get_cached_institutions()
+            if entry is None:
+                return await self._singleflight.do(
+                    INSTITUTIONS_CACHE_KEY,
+                    self._fetch_institutions,
+                    self._get_fresh_institutions
+                )
             
-            return response.get("results", [])
+            if time.time() - entry["fetched_at"] > settings.INSTITUTIONS_SOFT_TTL:
+                self._spawn(self._revalidate_institutions())
+            return entry["results"]
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def _get_cached_institutions(self) -> Dict | None:
+        """Read the cached catalog entry, None on a miss"""
+        cached = await self.cache.get(INSTITUTIONS_CACHE_KEY)
+        return codec.loads(cached) if cached else None
+
+    async def _get_fresh_institutions(self) -> List[Dict] | None:
+        entry = await self._get_cached_institutions()
+        if entry is None or time.time() - entry["fetched_at"] > settings.INSTITUTIONS_SOFT_TTL:
+            return None
+        return entry["results"]
+
+    async def _fetch_institutions(self) -> List[Dict]:
+        """Download the catalog from Belvo and cache it"""
+        response = await self._make_request("GET", "institutions/")
+        institutions = response.get("results", [])
+        
+        if institutions:
+            entry = {"fetched_at": time.time(), "results": institutions}
+            await self.cache.set(
+                INSTITUTIONS_CACHE_KEY,
+                codec.dumps(entry),
+                settings.INSTITUTIONS_HARD_TTL
+            )
+        return institutions
+
+    async def _revalidate_institutions(self):
+        """Background refresh; failures keep serving the stale catalog"""
+        try:
+            await self._singleflight.do(
+                INSTITUTIONS_CACHE_KEY,
+                self._fetch_institutions,
+                self._get_fresh_institutions
+            )
+        except Exception as e:
+            logger.warning(f"Institutions refresh failed, serving stale catalog: {e}")
+
+    async def _get_cached_list(self, cache_key: str) -> List[Dict] | None:
+        """Read a non-empty cached list, None on a miss"""
+        cached = await self.cache.get(cache_key)
+        if cached:
+            cached_data = codec.loads(cached)
+            if cached_data and len(cached_data) > 0:
+                return cached_data
+        return None
+
     async def get_accounts(self, link_id: str) -> List[Dict]:
         """Get accounts for a link with caching"""
-        redis = await self._get_redis()
         cache_key = f"accounts:{link_id}"
         
-        cached = await redis.get(cache_key)
-        if cached:
-            cached_data = json.loads(cached)
-            if cached_data and len(cached_data) > 0:
-                return self._transform_accounts(cached_data, link_id)
+        accounts = await self._get_cached_list(cache_key)
+        if accounts:
+            return self._transform_accounts(accounts, link_id)
         
         try:
-            await self._make_request(
-                "POST",
-                "accounts/",
-                json={"link": link_id, "save_data": True}
-            )
-            
-            response = await self._make_request(
-                "GET", 
-                "accounts/",
-                params={"link": link_id}
+            accounts = await self._singleflight.do(
+                cache_key,
+                lambda: self._fetch_accounts(link_id, cache_key),
+                lambda: self._get_cached_list(cache_key)
             )
-            accounts = response.get("results", [])
-            
-            if accounts and len(accounts) > 0:
-                transformed_accounts = self._transform_accounts(accounts, link_id)
-                await redis.set(cache_key, json.dumps(accounts), ex=300)
-                return transformed_accounts
-            
-            return []
-            
+            return self._transform_accounts(accounts, link_id)
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def _fetch_accounts(self, link_id: str, cache_key: str) -> List[Dict]:
+        """
+        Read the accounts Belvo already stores for the link and cache them; a
+        re-scrape is only scheduled in the background if they are stale
+        """
+        self._schedule_refresh(link_id, ["accounts"])
+        return await self._load_accounts(link_id, cache_key)
+
+    async def _load_accounts(self, link_id: str, cache_key: str) -> List[Dict]:
+        response = await self._make_request(
+            "GET", 
+            "accounts/",
+            params={"link": link_id}
+        )
+        accounts = response.get("results", [])
+        
+        if accounts and len(accounts) > 0:
+            await self.cache.set(cache_key, codec.dumps(accounts), 300)
+        
+        return accounts
+
     def _transform_accounts(self, accounts: List[Dict], link_id: str) -> List[Dict]:
         """Transform accounts to match schema"""
         for account in accounts:
@@ -107,58 +201,388 @@ class BelvoService:
                 account["institution"]["link_id"] = link_id
         return accounts
 
+    @staticmethod
+    def _transactions_version_key(account_id: str) -> str:
+        return f"transactions-version:{account_id}"
+
+    async def _transactions_cache_key(self, link_id: str, account_id: str,
+                                      date_from: str = None, date_to: str = None) -> str:
+        """
+        Key of a cached window of an account's transactions. It carries the
+        account's version, so bumping it retires every window at once.
+        """
+        version = await self.cache.get(self._transactions_version_key(account_id))
+        cache_key = f"transactions:{link_id}:{account_id}:v{int(version) if version else 0}"
+        if date_from or date_to:
+            cache_key = f"{cache_key}:{date_from or ''}:{date_to or ''}"
+        return cache_key
+
+    async def _invalidate_transactions(self, account_id: str):
+        """Retire every cached window of the account's transactions"""
+        # Outlives every cached window, so an expired version cannot revive one
+        await self.cache.set(
+            self._transactions_version_key(account_id), str(time.time_ns()), settings.LINK_FRESHNESS_TTL
+        )
+
     async def get_transactions(self, link_id: str, account_id: str, 
                              date_from: str = None, date_to: str = None) -> List[Dict]:
         """Get transactions for an account with caching"""
-        redis = await self._get_redis()
-        cache_key = f"transactions:{link_id}:{account_id}"
+        cache_key = await self._transactions_cache_key(link_id, account_id, date_from, date_to)
         
-        cached = await redis.get(cache_key)
-        if cached:
-            cached_data = json.loads(cached)
-            if cached_data and len(cached_data) > 0:
-                return cached_data
+        transactions = await self._get_cached_list(cache_key)
+        if transactions:
+            return transactions
         
         try:
-            # Calculate default dates if not provided
-            if not date_from or not date_to:
-                today = datetime.now()
-                default_from = (today - timedelta(days=90)).strftime("%Y-%m-%d")
-                default_to = today.strftime("%Y-%m-%d")
-                date_from = date_from or default_from
-                date_to = date_to or default_to
-
-            # register transactions
-            await self._make_request(
-                "POST",
-                "transactions/",
-                json={
-                    "link": link_id,
-                    "save_data": True,
-                    "date_from": date_from,
-                    "date_to": date_to
-                }
+            return await self._singleflight.do(
+                cache_key,
+                lambda: self._fetch_transactions(
+                    link_id, account_id, cache_key, date_from, date_to
+                ),
+                lambda: self._get_cached_list(cache_key)
             )
-            
-            # get transactions from Belvo
-            response = await self._make_request(
-                "GET", 
-                "transactions/",
-                params={
-                    "link": link_id,
-                    "account": account_id,
-                    "page_size": 100
-                }
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def _fetch_transactions(self, link_id: str, account_id: str, cache_key: str,
+                                  date_from: str = None, date_to: str = None) -> List[Dict]:
+        """Sync the local store, then read the requested window from it and cache it"""
+        await self.sync_transactions(link_id, account_id)
+        
+        async with AsyncSessionLocal() as session:
+            transactions = await TransactionRepository(session).list_by_account(
+                account_id, date_from=date_from, date_to=date_to
             )
+        
+        if transactions and len(transactions) > 0:
+            await self.cache.set(cache_key, codec.dumps(transactions), 300)
+        
+        return transactions
+
+    async def sync_transactions(self, link_id: str, account_id: str, force: bool = False) -> int:
+        """Bring the local store up to date for an account (one sync per account at a time)"""
+        return await self._singleflight.do(
+            f"transactions-sync:{account_id}",
+            lambda: self._sync_transactions(link_id, account_id, force)
+        )
+
+    async def _sync_transactions(self, link_id: str, account_id: str, force: bool = False) -> int:
+        """
+        Incremental sync: ask Belvo only for the window since the account's
+        last `collected_at` and upsert what comes back. Returns the number of
+        rows written.
+        """
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as session:
+            repo = TransactionRepository(session)
+            cursor = await repo.get_cursor(account_id)
             
-            transactions = response.get("results", [])
+            if cursor and cursor.synced_at and not force:
+                if now - cursor.synced_at < timedelta(seconds=settings.TRANSACTIONS_SYNC_INTERVAL):
+                    return 0
             
-            if transactions and len(transactions) > 0:
-                await redis.set(cache_key, json.dumps(transactions), ex=300)
+            last_collected_at = cursor.last_collected_at if cursor else None
+            date_from = collected_since = None
+            if last_collected_at:
+                # Filter on collection, not value date: Belvo can collect a
+                # transaction days after its value date
+                collected_since = (
+                    last_collected_at - timedelta(days=settings.TRANSACTIONS_SYNC_OVERLAP_DAYS)
+                ).isoformat()
+            else:
+                since = now - timedelta(days=settings.TRANSACTIONS_INITIAL_SYNC_DAYS)
+                date_from = since.date().isoformat()
             
-            return transactions
+            # Belvo's stored data only: re-scrapes never block a sync
+            self._schedule_refresh(link_id, ["transactions"], account_id)
+            
+            written = 0
+            batch = []
+            async for transaction in self.iter_transactions(
+                link_id, account_id, date_from=date_from, collected_since=collected_since
+            ):
+                batch.append(transaction)
+                collected_at = transaction.get("collected_at")
+                if collected_at:
+                    collected_at = datetime.fromisoformat(collected_at)
+                    if last_collected_at is None or collected_at > last_collected_at:
+                        last_collected_at = collected_at
+                if len(batch) >= settings.BELVO_TRANSACTIONS_PAGE_SIZE:
+                    written += await repo.upsert_many(link_id, account_id, batch)
+                    batch = []
+            written += await repo.upsert_many(link_id, account_id, batch)
+            
+            await repo.save_cursor(account_id, link_id, last_collected_at, now)
+            await session.commit()
+            return written
+
+    async def _get_refresh_interval(self, link_id: str) -> int | None:
+        """
+        Per-link refresh policy: seconds between re-scrapes, or None when we
+        should not scrape it (Belvo refreshes recurrent links on its own, and
+        a link that is not valid would only fail)
+        """
+        cache_key = f"link:{link_id}"
+        cached = await self.cache.get(cache_key)
+        if cached:
+            link = codec.loads(cached)
+        else:
+            link = await self._make_request("GET", f"links/{link_id}/")
+            await self.cache.set(cache_key, codec.dumps(link), settings.LINK_POLICY_TTL)
+        
+        if link.get("status") != "valid" or link.get("access_mode") == "recurrent":
+            return None
+        return settings.LINK_REFRESH_INTERVAL
+
+    @staticmethod
+    def _freshness_key(link_id: str) -> str:
+        return f"{settings.REDIS_LINK_FRESHNESS_KEY_PREFIX}{link_id}"
+
+    async def get_link_freshness(self, link_id: str) -> Dict[str, float]:
+        """When each resource of the link was last re-scraped (epoch seconds)"""
+        record = await self.redis.hgetall(self._freshness_key(link_id))
+        return {resource.decode(): float(scraped_at) for resource, scraped_at in record.items()}
+
+    async def refresh_link(self, link_id: str, resources: Sequence[str] = LINK_RESOURCES,
+                           account_ids: Sequence[str] = (), force: bool = False) -> List[str]:
+        """
+        Have Belvo re-scrape the bank for the link's stale resources and
+        record when each one was scraped. Returns the resources scraped.
+
+        One process scrapes a given resource at a time, under a claim that
+        expires after LINK_REFRESH_LOCK_TTL. After a transactions scrape the
+        `account_ids` are re-synced into the local store right away.
+        """
+        interval = await self._get_refresh_interval(link_id)
+        if interval is None and not force:
+            return []
+        
+        freshness = await self.get_link_freshness(link_id)
+        scraped = []
+        for resource in resources:
+            last_scraped = freshness.get(resource)
+            if not force and last_scraped and time.time() - last_scraped < interval:
+                continue
+            
+            lock_key = f"{settings.REDIS_LOCK_KEY_PREFIX}link-refresh:{link_id}:{resource}"
+            claimed = await self.redis.set(lock_key, 1, nx=True, ex=settings.LINK_REFRESH_LOCK_TTL)
+            if not claimed:
+                continue
+            
+            try:
+                await self._scrape(link_id, resource, last_scraped)
+            except Exception:
+                # Let the job's retry claim it again
+                await self.redis.delete(lock_key)
+                raise
+            
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(self._freshness_key(link_id), resource, time.time())
+                pipe.expire(self._freshness_key(link_id), settings.LINK_FRESHNESS_TTL)
+                await pipe.execute()
+            scraped.append(resource)
+        
+        if "accounts" in scraped:
+            await self._load_accounts(link_id, f"accounts:{link_id}")
+        if "transactions" in scraped:
+            for account_id in account_ids:
+                await self.sync_transactions(link_id, account_id, force=True)
+                await self._invalidate_transactions(account_id)
+        return scraped
+
+    async def _scrape(self, link_id: str, resource: str, last_scraped: float | None):
+        if resource == "accounts":
+            await self._register_accounts(link_id)
+            return
+        since = datetime.now(timezone.utc) - timedelta(days=settings.TRANSACTIONS_INITIAL_SYNC_DAYS)
+        if last_scraped:
+            since = datetime.fromtimestamp(last_scraped, timezone.utc) - timedelta(
+                days=settings.TRANSACTIONS_SYNC_OVERLAP_DAYS
+            )
+        await self._register_transactions(link_id, since.date().isoformat())
+
+    def _schedule_refresh(self, link_id: str, resources: Sequence[str], account_id: str = None):
+        """Queue a re-scrape of the link's resources for the job worker, off the read path"""
+        self._spawn(self._enqueue_refresh(link_id, resources, account_id))
+
+    async def _enqueue_refresh(self, link_id: str, resources: Sequence[str], account_id: str = None):
+        """The job itself checks staleness; this only rate-limits how often it is queued"""
+        try:
+            await get_job_queue().enqueue(
+                "refresh_link",
+                {
+                    "link_id": link_id,
+                    "resources": list(resources),
+                    "account_ids": [account_id] if account_id else [],
+                },
+                unique_for=settings.LINK_REFRESH_ENQUEUE_INTERVAL
+            )
         except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+            logger.warning(f"Could not queue a refresh of link {link_id}: {e}")
+
+    async def _enqueue_warm_up(self, link_id: str):
+        try:
+            await get_job_queue().enqueue("warm_link", {"link_id": link_id})
+        except Exception as e:
+            logger.warning(f"Could not queue the warm-up of link {link_id}: {e}")
+
+    async def _register_accounts(self, link_id: str):
+        """Ask Belvo to retrieve and store the link's accounts"""
+        await self._make_request(
+            "POST",
+            "accounts/",
+            json={"link": link_id, "save_data": True}
+        )
+
+    async def _register_transactions(self, link_id: str, date_from: str = None, date_to: str = None):
+        """Ask Belvo to retrieve and store the link's transactions"""
+        # Calculate default dates if not provided
+        if not date_from or not date_to:
+            today = datetime.now()
+            default_from = (today - timedelta(days=90)).strftime("%Y-%m-%d")
+            default_to = today.strftime("%Y-%m-%d")
+            date_from = date_from or default_from
+            date_to = date_to or default_to
+
+        await self._make_request(
+            "POST",
+            "transactions/",
+            json={
+                "link": link_id,
+                "save_data": True,
+                "date_from": date_from,
+                "date_to": date_to
+            }
+        )
+
+    async def get_kpi(self, link_id: str, account_id: str,
+                      date_from: str = None, date_to: str = None) -> CalculatedKPI:
+        """
+        KPIs of an account from the aggregates maintained on ingest: the
+        all-time totals row, or the sum of the day buckets in the range.
+        """
+        await self.sync_transactions(link_id, account_id)
+        
+        async with AsyncSessionLocal() as session:
+            repo = KPIRepository(session)
+            if date_from or date_to:
+                return make_kpi(*await repo.sum_days(account_id, date_from, date_to))
+            
+            totals = await repo.get_account(account_id)
+            if totals is None:
+                return make_kpi(None, 0, 0)
+            return make_kpi(totals.currency, totals.total_income_minor, totals.total_expenses_minor)
+
+    async def get_cash_flow(self, link_id: str, account_id: str, granularity: str = "monthly",
+                            date_from: str = None, date_to: str = None,
+                            top_merchants: int = 10) -> CashFlowAnalytics:
+        """Cash-flow breakdowns of an account, computed over columnar arrays"""
+        await self.sync_transactions(link_id, account_id)
+        columns = await self._get_transaction_columns(account_id)
+        return compute_cash_flow(columns.between(date_from, date_to), granularity, top_merchants)
+
+    async def _get_transaction_columns(self, account_id: str) -> TransactionColumns:
+        """
+        All transactions of an account as arrays, kept in process while the
+        account's aggregates (bumped on every ingest that changes rows) stay put
+        """
+        async with AsyncSessionLocal() as session:
+            totals = await KPIRepository(session).get_account(account_id)
+            version = totals.updated_at if totals else None
+            
+            cached = self._columns.get(account_id)
+            if cached and cached[0] == version:
+                return cached[1]
+            
+            currency, arrays = await TransactionRepository(session).columns_by_account(account_id)
+        
+        columns = TransactionColumns(currency, **arrays)
+        self._columns.set(
+            account_id, (version, columns), settings.ANALYTICS_COLUMNS_TTL, size=columns.nbytes
+        )
+        return columns
+
+    async def stream_transactions(self, link_id: str, account_id: str,
+                                  date_from: str = None, date_to: str = None) -> AsyncIterator[Dict]:
+        """
+        Yield transactions without building the full list for this request.
+
+        Serves the cached list when there is one; otherwise syncs the local
+        store and streams the window from it through a server-side cursor.
+        """
+        cached = await self._get_cached_list(
+            await self._transactions_cache_key(link_id, account_id, date_from, date_to)
+        )
+        if cached:
+            for transaction in cached:
+                yield transaction
+            return
+
+        await self.sync_transactions(link_id, account_id)
+        async with AsyncSessionLocal() as session:
+            async for transaction in TransactionRepository(session).iter_by_account(
+                account_id, date_from=date_from, date_to=date_to
+            ):
+                yield transaction
+
+    async def iter_transactions(self, link_id: str, account_id: str, date_from: str = None,
+                                collected_since: str = None) -> AsyncIterator[Dict]:
+        """
+        Yield every transaction Belvo stores for an account (with a value
+        date from `date_from` on, or collected since `collected_since`, when
+        given), page by page.
+
+        The first page gives the total count; the remaining pages are fetched
+        concurrently (at most BELVO_PAGE_CONCURRENCY in flight) and yielded in
+        order, so only a bounded window of pages is held in memory.
+        """
+        page_size = settings.BELVO_TRANSACTIONS_PAGE_SIZE
+        params = {"link": link_id, "account": account_id, "page_size": page_size}
+        if date_from:
+            params["value_date__gte"] = date_from
+        if collected_since:
+            params["collected_at__gte"] = collected_since
+
+        first_page = await self._make_request("GET", "transactions/", params={**params, "page": 1})
+        for transaction in first_page.get("results", []):
+            yield transaction
+
+        if not first_page.get("next"):
+            return
+
+        count = first_page.get("count")
+        if count is None:
+            # No total to plan with: follow the cursor sequentially
+            next_url = first_page.get("next")
+            while next_url:
+                page = await self._make_request("GET", next_url.split("/api/", 1)[-1])
+                for transaction in page.get("results", []):
+                    yield transaction
+                next_url = page.get("next")
+            return
+
+        pages = iter(range(2, math.ceil(count / page_size) + 1))
+        window: deque[asyncio.Task] = deque()
+
+        def schedule_next():
+            page_number = next(pages, None)
+            if page_number is not None:
+                window.append(asyncio.create_task(
+                    self._make_request("GET", "transactions/", params={**params, "page": page_number})
+                ))
+
+        try:
+            for _ in range(settings.BELVO_PAGE_CONCURRENCY):
+                schedule_next()
+            while window:
+                page = await window.popleft()
+                schedule_next()
+                for transaction in page.get("results", []):
+                    yield transaction
+        finally:
+            for task in window:
+                task.cancel()
+            await asyncio.gather(*window, return_exceptions=True)
 
     async def create_link(
         self, 
@@ -188,6 +612,10 @@ class BelvoService:
                 json=payload
             )
             
+            # Warm up Belvo's stored data and the local store so the first reads have something to serve
+            for link in response.get("results", [response]):
+                await self._enqueue_warm_up(link["id"])
+            
             if isinstance(response, dict) and "results" in response:
                 return {
                     "count": response.get("count", 0),
@@ -207,17 +635,59 @@ class BelvoService:
             raise HTTPException(status_code=500, detail=str(e))
 
     async def get_account_details(self, link_id: str, account_id: str) -> Dict:
-        """Get specific account details"""
+        """Get specific account details with caching"""
+        cache_key = f"account:{link_id}:{account_id}"
+        
+        account = await self._get_cached_account_details(cache_key)
+        if account:
+            return account
+        
         try:
-            response = await self._make_request(
-                "GET", 
-                f"accounts/{account_id}/",
-                params={"link": link_id}
+            return await self._singleflight.do(
+                cache_key,
+                lambda: self._fetch_account_details(link_id, account_id, cache_key),
+                lambda: self._get_cached_account_details(cache_key)
             )
-            return response
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def _get_cached_account_details(self, cache_key: str) -> Dict | None:
+        cached = await self.cache.get(cache_key)
+        return codec.loads(cached) if cached else None
+
+    async def _fetch_account_details(self, link_id: str, account_id: str, cache_key: str) -> Dict:
+        """Fetch one account from Belvo and cache it"""
+        account = await self._make_request(
+            "GET", 
+            f"accounts/{account_id}/",
+            params={"link": link_id}
+        )
+        if account:
+            await self.cache.set(cache_key, codec.dumps(account), 300)
+        return account
+
+    async def get_transactions_overview(self, link_id: str, account_id: str,
+                                        date_from: str = None, date_to: str = None
+                                        ) -> Tuple[List[Dict], CalculatedKPI, Dict]:
+        """
+        Transactions, KPIs and account details of an account, fetched
+        concurrently. The KPI read shares the transactions sync (single-flight)
+        and the account details call is independent of both. If one fails the
+        others are cancelled and its error is raised as is.
+        """
+        try:
+            async with asyncio.TaskGroup() as group:
+                transactions = group.create_task(
+                    self.get_transactions(link_id, account_id, date_from=date_from, date_to=date_to)
+                )
+                kpi = group.create_task(
+                    self.get_kpi(link_id, account_id, date_from=date_from, date_to=date_to)
+                )
+                account_info = group.create_task(self.get_account_details(link_id, account_id))
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0]
+        return transactions.result(), kpi.result(), account_info.result()
+
 @lru_cache()
 def get_belvo_service() -> BelvoService:
     """Get singleton instance of BelvoService"""
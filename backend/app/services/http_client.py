@@ -0,0 +1,93 @@
+from typing import Dict, Any
+import logging
+import httpx
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 needs the optional `h2` package"""
+    if not settings.BELVO_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("BELVO_HTTP2 is enabled but 'h2' is not installed, using HTTP/1.1")
+        return False
+    return True
+
+
+def create_belvo_client() -> httpx.AsyncClient:
+    """Build the pooled HTTP client used for Belvo traffic"""
+    return httpx.AsyncClient(
+        base_url=settings.BELVO_API_URL,
+        auth=(settings.BELVO_SECRET_ID, settings.BELVO_SECRET_PASSWORD),
+        http2=_http2_enabled(),
+        limits=httpx.Limits(
+            max_connections=settings.BELVO_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.BELVO_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.BELVO_HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.BELVO_HTTP_CONNECT_TIMEOUT,
+            read=settings.BELVO_HTTP_READ_TIMEOUT,
+            write=settings.BELVO_HTTP_WRITE_TIMEOUT,
+            pool=settings.BELVO_HTTP_POOL_TIMEOUT,
+        ),
+    )
+
+
+def init_belvo_client() -> httpx.AsyncClient:
+    """Create the worker-wide Belvo client (called from the app lifespan)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_belvo_client()
+    return _client
+
+
+async def close_belvo_client():
+    """Close the Belvo client and release pooled connections"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_belvo_client() -> httpx.AsyncClient:
+    """Get the shared Belvo client, creating it if the lifespan did not run"""
+    if _client is None or _client.is_closed:
+        return init_belvo_client()
+    return _client
+
+
+def get_belvo_pool_stats() -> Dict[str, Any]:
+    """Connection pool statistics for the shared Belvo client"""
+    stats = {
+        "initialized": _client is not None and not _client.is_closed,
+        "http2": settings.BELVO_HTTP2,
+        "max_connections": settings.BELVO_HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.BELVO_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        "connections": 0,
+        "idle": 0,
+        "active": 0,
+        "pending_requests": 0,
+    }
+    if not stats["initialized"]:
+        return stats
+
+    pool = getattr(_client._transport, "_pool", None)
+    if pool is None:
+        return stats
+
+    connections = list(pool.connections)
+    idle = sum(1 for conn in connections if conn.is_idle())
+    stats["connections"] = len(connections)
+    stats["idle"] = idle
+    stats["active"] = len(connections) - idle
+    stats["pending_requests"] = sum(
+        1 for request in getattr(pool, "_requests", []) if request.is_queued()
+    )
+    return stats
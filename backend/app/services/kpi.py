@@ -0,0 +1,45 @@
+from typing import Dict, Iterable
+from app.core.money import exponent, to_decimal, to_minor
+from app.schemas.belvo import CalculatedKPI
+
+def make_kpi(currency: str | None, income_minor: int, expenses_minor: int) -> CalculatedKPI:
+    """KPIs from income and expense totals in minor units"""
+    return CalculatedKPI(
+        total_income=to_decimal(income_minor, currency),
+        total_expenses=to_decimal(expenses_minor, currency),
+        net_balance=to_decimal(income_minor - expenses_minor, currency)
+    )
+
+class KPIAccumulator:
+    """Running income/expense totals in minor units, fed one transaction at a time"""
+
+    def __init__(self):
+        self.currency = None
+        self._scale = 0
+        self.income_minor = 0
+        self.expenses_minor = 0
+
+    def add(self, transaction: Dict):
+        amount = transaction["amount"]
+        if transaction["currency"] != self.currency:
+            self.currency = transaction["currency"]
+            self._scale = 10 ** exponent(self.currency)
+        # Floats are by far the common case, see app.core.money.to_minor
+        if isinstance(amount, float):
+            amount = round(amount * self._scale)
+        else:
+            amount = to_minor(amount, self.currency)
+        if transaction["type"] == "INFLOW":
+            self.income_minor += amount
+        else:
+            self.expenses_minor += amount
+
+    def result(self) -> CalculatedKPI:
+        return make_kpi(self.currency, self.income_minor, self.expenses_minor)
+
+def compute_kpi(transactions: Iterable[Dict]) -> CalculatedKPI:
+    """KPIs for a list (or any iterable) of transactions"""
+    accumulator = KPIAccumulator()
+    for transaction in transactions:
+        accumulator.add(transaction)
+    return accumulator.result()
@@ -1,24 +1,22 @@
 from datetime import datetime, timedelta
+from typing import Iterable, Tuple
 from app.core.config import settings
 from redis import asyncio as aioredis
+from app.core.redis import get_redis
+from app.core.revocations import get_revocation_filter
 import json
 
 class TokenService:
-    def __init__(self):
-        self._redis = None
+    def __init__(self, redis: aioredis.Redis | None = None):
+        self._redis = redis
 
-    async def _get_redis(self):
-        if not self._redis:
-            self._redis = await aioredis.from_url(
-                f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-                encoding="utf-8",
-                decode_responses=True
-            )
-        return self._redis
+    @property
+    def redis(self) -> aioredis.Redis:
+        return self._redis or get_redis()
 
     async def store_refresh_token(self, user_id: int, refresh_token: str):
         """Store refresh token in Redis"""
-        redis = await self._get_redis()
+        redis = self.redis
         key = f"{settings.REDIS_REFRESH_TOKEN_KEY_PREFIX}{user_id}"
         expiration = int(timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS).total_seconds())
         await redis.set(
@@ -27,10 +25,9 @@ class TokenService:
             ex=expiration
         )
 
-    async def blacklist_token(self, token: str, expires_at: datetime):
-        """Add token to blacklist"""
-        redis = await self._get_redis()
-        key = f"{settings.REDIS_BLACKLIST_KEY_PREFIX}{token}"
+    def _blacklist(self, pipe: aioredis.client.Pipeline, token_id: str, expires_at: datetime):
+        """Queue a blacklist entry, and its announcement to the other workers, on `pipe`"""
+        key = f"{settings.REDIS_BLACKLIST_KEY_PREFIX}{token_id}"
         
         now = datetime.utcnow()
         if expires_at <= now:
@@ -41,30 +38,45 @@ class TokenService:
                 settings.MIN_BLACKLIST_TIME
             )
         
-        await redis.set(key, "1", ex=expiration)
-        exists = await redis.exists(key)
+        pipe.set(key, "1", ex=expiration)
+        get_revocation_filter().publish(pipe, token_id)
+
+    async def revoke_tokens(self, tokens: Iterable[Tuple[str, dict]]):
+        """
+        Blacklist tokens given as (token id, claims) and remove the stored
+        refresh token for the refresh tokens among them, in one round trip
+        """
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for token_id, payload in tokens:
+                self._blacklist(pipe, token_id, datetime.utcfromtimestamp(payload["exp"]))
+                if payload.get("type") == "refresh":
+                    pipe.delete(f"{settings.REDIS_REFRESH_TOKEN_KEY_PREFIX}{payload.get('sub')}")
+            await pipe.execute()
 
-    async def is_token_blacklisted(self, token: str) -> bool:
-        """Check if token is blacklisted"""
-        redis = await self._get_redis()
-        key = f"{settings.REDIS_BLACKLIST_KEY_PREFIX}{token}"
+    async def is_token_blacklisted(self, token_id: str) -> bool:
+        """Check if token is blacklisted (Redis is only asked if the filter says maybe)"""
+        if not get_revocation_filter().might_contain(token_id):
+            return False
+        redis = self.redis
+        key = f"{settings.REDIS_BLACKLIST_KEY_PREFIX}{token_id}"
         exists = await redis.exists(key)
         return exists
 
     async def get_refresh_token(self, user_id: int) -> str:
         """Get refresh token for user"""
-        redis = await self._get_redis()
+        redis = self.redis
         key = f"{settings.REDIS_REFRESH_TOKEN_KEY_PREFIX}{user_id}"
-        return await redis.get(key)
+        token = await redis.get(key)
+        return token.decode() if token else None
 
     async def remove_refresh_token(self, user_id: int):
         """Remove refresh token from Redis"""
-        redis = await self._get_redis()
+        redis = self.redis
         key = f"{settings.REDIS_REFRESH_TOKEN_KEY_PREFIX}{user_id}"
         await redis.delete(key)
 
     async def cleanup_blacklist(self):
         """Remove expired tokens from blacklist"""
-        redis = await self._get_redis()
+        redis = self.redis
 
         pass 
\ No newline at end of file
@@ -0,0 +1,36 @@
+"""Size and encode/decode time of cached Belvo transaction lists.
+
+Compares the previous format (json.dumps text) with app.core.codec.
+
+    poetry run python -m benchmarks.cache_codec
+"""
+import json
+import timeit
+
+from app.core import codec
+from benchmarks.fixtures import make_transactions
+
+
+def measure(encode, decode, value, number: int):
+    payload = encode(value)
+    encode_time = timeit.timeit(lambda: encode(value), number=number) / number
+    decode_time = timeit.timeit(lambda: decode(payload), number=number) / number
+    return len(payload), encode_time * 1e6, decode_time * 1e6
+
+
+def main():
+    print(f"{'rows':>6} {'format':<14} {'bytes':>10} {'ratio':>7} {'encode us':>11} {'decode us':>11}")
+    for rows in (100, 1_000, 10_000):
+        transactions = make_transactions(rows)
+        number = max(10, 20_000 // rows)
+        baseline = measure(json.dumps, json.loads, transactions, number)
+        binary = measure(codec.dumps, codec.loads, transactions, number)
+        for name, (size, encode_us, decode_us) in (("json text", baseline), ("orjson+zstd", binary)):
+            print(
+                f"{rows:>6} {name:<14} {size:>10} {baseline[0] / size:>6.1f}x"
+                f" {encode_us:>11.0f} {decode_us:>11.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
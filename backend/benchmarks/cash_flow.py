@@ -0,0 +1,77 @@
+"""Cash-flow analytics over 100k transactions: dict loops vs NumPy columns.
+
+"dict loop" groups the Belvo dicts in plain Python, "columnar" builds
+app.services.analytics.TransactionColumns from the per-column arrays the
+repository returns and runs compute_cash_flow on them, "cached" runs
+compute_cash_flow on columns already built, as BelvoService keeps them.
+
+    poetry run python -m benchmarks.cash_flow
+"""
+import timeit
+from collections import defaultdict
+from datetime import date
+
+from app.core.money import to_minor
+from app.services.analytics import TransactionColumns, compute_cash_flow
+from benchmarks.fixtures import make_transactions
+
+ROWS = 100_000
+EPOCH = date(1970, 1, 1)
+
+
+def dict_loop(transactions, granularity: str):
+    buckets = defaultdict(lambda: [0, 0, 0])
+    categories = defaultdict(lambda: [0, 0, 0])
+    merchants = defaultdict(lambda: [0, 0])
+    for transaction in transactions:
+        day = date.fromisoformat(transaction["value_date"])
+        if granularity == "monthly":
+            period = day.replace(day=1)
+        elif granularity == "weekly":
+            period = date.fromordinal(day.toordinal() - day.weekday())
+        else:
+            period = day
+        amount = to_minor(transaction["amount"], transaction["currency"])
+        inflow = transaction["type"] == "INFLOW"
+        for totals in (buckets[period], categories[transaction["category"], transaction["subcategory"]]):
+            totals[0 if inflow else 1] += amount
+            totals[2] += 1
+        merchant = (transaction.get("merchant") or {}).get("merchant_name")
+        if merchant and not inflow:
+            merchants[merchant][0] += amount
+            merchants[merchant][1] += 1
+    top = sorted(merchants.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    return sorted(buckets.items()), categories, top
+
+
+def to_columns(transactions):
+    """What TransactionRepository.columns_by_account returns for these rows"""
+    return {
+        "epoch_day": [(date.fromisoformat(t["value_date"]) - EPOCH).days for t in transactions],
+        "amount_minor": [to_minor(t["amount"], t["currency"]) for t in transactions],
+        "inflow": [t["type"] == "INFLOW" for t in transactions],
+        "category": [t["category"] or "" for t in transactions],
+        "subcategory": [t["subcategory"] or "" for t in transactions],
+        "merchant_name": [(t.get("merchant") or {}).get("merchant_name") or "" for t in transactions],
+    }
+
+
+def main():
+    transactions = make_transactions(ROWS)
+    columns = to_columns(transactions)
+
+    built = TransactionColumns("MXN", **columns)
+
+    print(f"{'granularity':<12} {'dict loop ms':>13} {'columnar ms':>12} {'cached ms':>10}")
+    for granularity in ("daily", "weekly", "monthly"):
+        loop = min(timeit.repeat(lambda: dict_loop(transactions, granularity), number=1, repeat=3))
+        columnar = min(timeit.repeat(
+            lambda: compute_cash_flow(TransactionColumns("MXN", **columns), granularity),
+            number=1, repeat=5
+        ))
+        cached = min(timeit.repeat(lambda: compute_cash_flow(built, granularity), number=1, repeat=5))
+        print(f"{granularity:<12} {loop * 1000:>13.1f} {columnar * 1000:>12.1f} {cached * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
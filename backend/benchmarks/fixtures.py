@@ -0,0 +1,78 @@
+"""Synthetic Belvo payloads shaped like the sandbox responses"""
+from datetime import date, timedelta
+import random
+import uuid
+
+CATEGORIES = {
+    "Food & Groceries": ["Groceries", "Restaurants"],
+    "Transport & Travel": ["Fuel", "Public Transport", "Flights"],
+    "Bills & Utilities": ["Electricity", "Internet", "Phone"],
+    "Income & Payments": ["Salary", "Transfers"],
+    "Online Platforms & Leisure": ["Streaming", "Gaming"],
+    "Shopping": ["Clothing", "Electronics"],
+}
+
+MERCHANTS = [
+    ("Walmart", "https://walmart.com"),
+    ("Uber", "https://uber.com"),
+    ("Netflix", "https://netflix.com"),
+    ("Oxxo", "https://oxxo.com"),
+    ("Amazon", "https://amazon.com"),
+    (None, None),
+]
+
+
+def make_account(link_id: str, account_id: str | None = None) -> dict:
+    return {
+        "id": account_id or str(uuid.uuid4()),
+        "link": link_id,
+        "institution": {"name": "erebor_mx_retail", "type": "bank"},
+        "created_at": "2025-04-16T22:26:33.172310Z",
+        "collected_at": "2025-04-16T22:26:33.172310Z",
+        "category": "CHECKING_ACCOUNT",
+        "balance_type": "ASSET",
+        "type": "Cuentas de efectivo",
+        "name": "Cuenta Perfiles- M.N. - MXN-666",
+        "number": "4057068115181",
+        "agency": "0444",
+        "balance": {"current": 5874.13, "available": 5621.12},
+        "currency": "MXN",
+        "public_identification_name": "CLABE",
+        "public_identification_value": "150194683119900273",
+    }
+
+
+def make_transactions(count: int, seed: int = 42, account: dict | None = None) -> list[dict]:
+    """`count` transactions for one account over roughly the last two years"""
+    rng = random.Random(seed)
+    account = account or make_account(str(uuid.UUID(int=rng.getrandbits(128))))
+    start = date(2023, 1, 1)
+    transactions = []
+    for _ in range(count):
+        category = rng.choice(list(CATEGORIES))
+        merchant_name, website = rng.choice(MERCHANTS)
+        inflow = category == "Income & Payments"
+        transactions.append({
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "account": account,
+            "created_at": "2025-04-16T22:26:41.917562Z",
+            "collected_at": "2025-04-16T22:26:41.917562Z",
+            "value_date": (start + timedelta(days=rng.randrange(730))).isoformat(),
+            "accounting_date": "2025-04-16T00:00:00Z",
+            "amount": round(rng.uniform(5, 25000 if inflow else 3000), 2),
+            "balance": round(rng.uniform(0, 50000), 2),
+            "currency": "MXN",
+            "description": f"{merchant_name or 'SPEI'} {rng.randrange(10**6):06d}",
+            "observations": None,
+            "category": category,
+            "subcategory": rng.choice(CATEGORIES[category]),
+            "type": "INFLOW" if inflow else "OUTFLOW",
+            "status": "PROCESSED",
+            "reference": str(rng.randrange(10**8)),
+            "merchant": {
+                "logo": f"{website}/logo.png" if website else None,
+                "website": website,
+                "merchant_name": merchant_name,
+            },
+        })
+    return transactions
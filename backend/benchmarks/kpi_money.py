@@ -0,0 +1,62 @@
+"""KPI computation over 100k transactions: Decimal amounts vs integer minor units.
+
+"decimal" is the previous loop (Decimal(str(amount)) per row), "minor units"
+is app.services.kpi.compute_kpi converting each float once, and "stored
+minor" adds up amounts already normalized at ingestion, as the rollups do.
+
+    poetry run python -m benchmarks.kpi_money
+"""
+import timeit
+from decimal import Decimal
+
+from app.core.money import to_minor
+from app.services.kpi import compute_kpi, make_kpi
+from benchmarks.fixtures import make_transactions
+
+ROWS = 100_000
+
+
+def legacy_kpi(transactions):
+    total_income = Decimal(0)
+    total_expenses = Decimal(0)
+    for transaction in transactions:
+        amount = Decimal(str(transaction["amount"]))
+        if transaction["type"] == "INFLOW":
+            total_income += amount
+        else:
+            total_expenses += amount
+    return total_income, total_expenses, total_income - total_expenses
+
+
+def stored_kpi(rows):
+    income = expenses = 0
+    for amount_minor, inflow in rows:
+        if inflow:
+            income += amount_minor
+        else:
+            expenses += amount_minor
+    return make_kpi("MXN", income, expenses)
+
+
+def main():
+    transactions = make_transactions(ROWS)
+    rows = [(to_minor(t["amount"], t["currency"]), t["type"] == "INFLOW") for t in transactions]
+
+    legacy = legacy_kpi(transactions)
+    for kpi in (compute_kpi(transactions), stored_kpi(rows)):
+        assert (kpi.total_income, kpi.total_expenses, kpi.net_balance) == legacy
+
+    print(f"{'path':<14} {'ms':>8} {'speedup':>8}")
+    baseline = None
+    for name, run in (
+        ("decimal", lambda: legacy_kpi(transactions)),
+        ("minor units", lambda: compute_kpi(transactions)),
+        ("stored minor", lambda: stored_kpi(rows)),
+    ):
+        elapsed = min(timeit.repeat(run, number=1, repeat=5)) * 1000
+        baseline = baseline or elapsed
+        print(f"{name:<14} {elapsed:>8.1f} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
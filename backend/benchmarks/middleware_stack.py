@@ -0,0 +1,145 @@
+"""Requests/sec of the Error/Auth/Cache middleware stack on a trivial authenticated GET.
+
+Compares the previous BaseHTTPMiddleware implementation against the pure-ASGI
+middleware by calling the ASGI app directly, so no server or socket overhead is
+included. Redis is replaced by an in-memory stand-in that always misses, which
+exercises the full stack (blacklist check, token verification and cache tee).
+
+    poetry run python -m benchmarks.middleware_stack
+"""
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI, Request, HTTPException, status
+from fastapi.responses import JSONResponse
+from fastapi.security import HTTPBearer
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.api.middleware import auth as auth_module
+from app.api.middleware.auth import AuthMiddleware
+from app.api.middleware.cache import CacheMiddleware
+from app.api.middleware.error import ErrorMiddleware
+from app.core.security import create_token_pair, verify_token
+
+REQUESTS = 20_000
+
+
+class MissingRedis:
+    """Redis (and cache) stand-in whose reads always miss"""
+
+    async def get(self, key):
+        return None
+
+    async def set(self, key, value, ex=None):
+        return True
+
+    async def exists(self, key):
+        return 0
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    security = HTTPBearer()
+
+    async def dispatch(self, request: Request, call_next):
+        credentials = await self.security(request)
+        token = credentials.credentials
+        if await auth_module.token_service.is_token_blacklisted(token):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        if not verify_token(token, token_type="access"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        return await call_next(request)
+
+
+class LegacyCacheMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, redis):
+        super().__init__(app)
+        self.redis = redis
+
+    async def dispatch(self, request: Request, call_next):
+        cache_key = f"cache:{request.url.path}"
+        cached_response = await self.redis.get(cache_key)
+        if cached_response:
+            return JSONResponse(content=json.loads(cached_response))
+        response = await call_next(request)
+        if response.status_code == 200:
+            response_body = b""
+            async for chunk in response.body_iterator:
+                response_body += chunk
+            content = json.loads(response_body.decode())
+            await self.redis.set(cache_key, json.dumps(content), ex=300)
+            return JSONResponse(content=content)
+        return response
+
+
+class LegacyErrorMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        try:
+            return await call_next(request)
+        except HTTPException as exc:
+            return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+
+
+def build_app(legacy: bool, redis) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    if legacy:
+        app.add_middleware(LegacyCacheMiddleware, redis=redis)
+        app.add_middleware(LegacyAuthMiddleware)
+        app.add_middleware(LegacyErrorMiddleware)
+    else:
+        app.add_middleware(CacheMiddleware, cache=redis)
+        app.add_middleware(AuthMiddleware)
+        app.add_middleware(ErrorMiddleware)
+    return app
+
+
+async def run(app: FastAPI, token: str, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/ping",
+        "raw_path": b"/api/v1/ping",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - start)
+
+
+async def main():
+    redis = MissingRedis()
+    auth_module.token_service._redis = redis
+    token, _ = create_token_pair(1)
+
+    before = await run(build_app(True, redis), token, REQUESTS)
+    after = await run(build_app(False, redis), token, REQUESTS)
+    print(f"BaseHTTPMiddleware stack: {before:10.0f} req/s")
+    print(f"pure ASGI stack:          {after:10.0f} req/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
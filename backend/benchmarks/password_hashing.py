@@ -0,0 +1,60 @@
+"""A burst of 16 logins: bcrypt inline on the event loop vs the hashing pool.
+
+While the logins run, a probe task ticks every millisecond; its worst delay
+is how long any other request on the worker would have been stalled.
+
+    poetry run python -m benchmarks.password_hashing
+"""
+import asyncio
+import time
+
+from app.core.passwords import PasswordHasher
+from app.core.security import pwd_context
+
+LOGINS = 16
+PASSWORD = "correct horse battery staple"
+
+
+async def probe(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        worst = max(worst, time.perf_counter() - started - 0.001)
+    return worst
+
+
+async def inline_login(hashed: str):
+    await asyncio.sleep(0)
+    return pwd_context.verify_and_update(PASSWORD, hashed)
+
+
+async def run(login) -> tuple[float, float]:
+    stop = asyncio.Event()
+    lag = asyncio.create_task(probe(stop))
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, await lag
+
+
+async def main():
+    hashed = pwd_context.hash(PASSWORD)
+    hasher = PasswordHasher()
+
+    print(f"bcrypt rounds {hashed.split('$')[2]}, pool of {hasher.max_workers} threads")
+    print(f"{'path':<8} {'burst ms':>9} {'max loop stall ms':>18}")
+    for name, login in (
+        ("inline", lambda: inline_login(hashed)),
+        ("pool", lambda: hasher.verify(PASSWORD, hashed)),
+    ):
+        elapsed, stall = await run(login)
+        print(f"{name:<8} {elapsed * 1000:>9.0f} {stall * 1000:>18.1f}")
+    print(hasher.stats())
+    hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
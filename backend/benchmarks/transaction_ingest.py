@@ -0,0 +1,74 @@
+"""Rows/sec ingesting Belvo transactions into Postgres.
+
+Compares the ORM path (one `Transaction` object per row, merged through the
+session) with `TransactionRepository.upsert_many` (binary COPY into a staging
+table, then INSERT ... ON CONFLICT). Each path writes a fresh account and then
+re-ingests the same rows, as an overlapping sync does. Needs a running
+Postgres with the migrations applied; the benchmark rows are deleted at the end.
+
+    poetry run python -m benchmarks.transaction_ingest
+"""
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models.transaction import Transaction
+from app.db.partitions import ensure_partitions
+from app.db.repositories.transactions import COPY_COLUMNS, TransactionRepository, to_record
+from app.db.session import SQLALCHEMY_DATABASE_URL
+from benchmarks.fixtures import make_transactions
+
+BATCH = 1_000
+
+
+async def ingest_orm(session: AsyncSession, link_id: str, account_id: str, transactions: list[dict]):
+    for start in range(0, len(transactions), BATCH):
+        batch = transactions[start:start + BATCH]
+        records = [to_record(link_id, account_id, transaction, None) for transaction in batch]
+        await ensure_partitions(session.bind, (record[3] for record in records))
+        for transaction, record in zip(batch, records):
+            row = dict(zip(COPY_COLUMNS, record))
+            row["data"] = transaction
+            del row["created_at"], row["updated_at"]
+            await session.merge(Transaction(**row))
+        await session.flush()
+
+
+async def ingest_copy(session: AsyncSession, link_id: str, account_id: str, transactions: list[dict]):
+    repo = TransactionRepository(session)
+    for start in range(0, len(transactions), BATCH):
+        await repo.upsert_many(link_id, account_id, transactions[start:start + BATCH])
+
+
+async def main():
+    engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    accounts = []
+    print(f"{'rows':>7} {'path':<12} {'insert rows/s':>14} {'update rows/s':>14}")
+    try:
+        for rows in (1_000, 10_000, 50_000):
+            for seed, (name, ingest) in enumerate((("orm merge", ingest_orm), ("copy", ingest_copy))):
+                link_id, account_id = str(uuid.uuid4()), str(uuid.uuid4())
+                accounts.append(account_id)
+                transactions = make_transactions(rows, seed=rows + seed)
+                rates = []
+                for _ in range(2):
+                    async with Session() as session:
+                        start = time.perf_counter()
+                        await ingest(session, link_id, account_id, transactions)
+                        await session.commit()
+                        rates.append(rows / (time.perf_counter() - start))
+                print(f"{rows:>7} {name:<12} {rates[0]:>14,.0f} {rates[1]:>14,.0f}")
+    finally:
+        async with Session() as session:
+            await session.execute(delete(Transaction).where(Transaction.account_id.in_(accounts)))
+            await session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""Latency of a one-month account range query as the transactions table grows.
+
+Seeds a plain table (previous layout) and a month-partitioned one with the
+same rows in a scratch schema of the configured database, then times the
+query `list_by_account` issues for a month of one account and a month-wide
+total. Accounts grow with the table (ROWS_PER_ACCOUNT each), so an account
+month returns about the same number of rows at every size and only the
+table size changes. Needs a running Postgres; the scratch schema is dropped
+at the end.
+
+    poetry run python -m benchmarks.transaction_partitions
+"""
+import asyncio
+import time
+from datetime import date
+
+import asyncpg
+
+from app.core.config import settings
+
+SCHEMA = "bench_partitions"
+ROWS_PER_ACCOUNT = 100
+MONTHS = 36
+QUERIES = 200
+
+COLUMNS = """
+    id VARCHAR NOT NULL,
+    account_id VARCHAR NOT NULL,
+    value_date DATE NOT NULL,
+    amount NUMERIC(18, 2) NOT NULL,
+    data JSONB NOT NULL
+"""
+
+SEED_SQL = """
+    INSERT INTO {table}
+    SELECT
+        md5(n::text),
+        'account-' || (n / {rows_per_account}),
+        DATE '2022-01-01' + (n::bigint * 7919 % ({months} * 30))::int,
+        (n % 100000) / 100.0,
+        jsonb_build_object('id', md5(n::text), 'amount', (n % 100000) / 100.0)
+    FROM generate_series({start}, {stop} - 1) AS n
+"""
+
+ACCOUNT_SQL = """
+    SELECT data FROM {table}
+    WHERE account_id = $1 AND value_date >= $2 AND value_date <= $3
+    ORDER BY value_date DESC, id
+"""
+
+MONTH_SQL = """
+    SELECT sum(amount) FROM {table}
+    WHERE value_date >= $1 AND value_date <= $2
+"""
+
+
+async def create_tables(conn: asyncpg.Connection):
+    await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+    await conn.execute(f"CREATE TABLE {SCHEMA}.plain ({COLUMNS}, PRIMARY KEY (id))")
+    await conn.execute(f"CREATE INDEX ON {SCHEMA}.plain (account_id, value_date)")
+    await conn.execute(
+        f"CREATE TABLE {SCHEMA}.partitioned ({COLUMNS}, PRIMARY KEY (id, value_date)) "
+        f"PARTITION BY RANGE (value_date)"
+    )
+    await conn.execute(f"CREATE INDEX ON {SCHEMA}.partitioned (account_id, value_date)")
+    await conn.execute(f"CREATE INDEX ON {SCHEMA}.partitioned USING brin (value_date)")
+    for month in range(MONTHS + 1):
+        await conn.execute(
+            f"CREATE TABLE {SCHEMA}.partitioned_{month} PARTITION OF {SCHEMA}.partitioned "
+            f"FOR VALUES FROM (DATE '2022-01-01' + interval '{month} month') "
+            f"TO (DATE '2022-01-01' + interval '{month + 1} month')"
+        )
+
+
+async def time_queries(conn: asyncpg.Connection, sql: str, table: str, per_account: bool,
+                       accounts: int) -> float:
+    """Median latency in ms of month-range queries, optionally for one account"""
+    statement = await conn.prepare(sql.format(table=f"{SCHEMA}.{table}"))
+    queries = QUERIES if per_account else QUERIES // 10
+    samples = []
+    for i in range(queries):
+        month = i % MONTHS
+        first_day = date(2022 + month // 12, month % 12 + 1, 1)
+        args = (first_day, first_day.replace(day=28))
+        if per_account:
+            args = (f"account-{i * 37 % accounts}",) + args
+        start = time.perf_counter()
+        await statement.fetch(*args)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+async def main():
+    conn = await asyncpg.connect(
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        database=settings.POSTGRES_DB,
+    )
+    try:
+        await create_tables(conn)
+        print(f"{'rows':>10} {'query':<14} {'plain ms':>10} {'partitioned ms':>15}")
+        seeded = 0
+        for rows in (100_000, 1_000_000, 4_000_000):
+            for table in ("plain", "partitioned"):
+                await conn.execute(SEED_SQL.format(
+                    table=f"{SCHEMA}.{table}", rows_per_account=ROWS_PER_ACCOUNT, months=MONTHS,
+                    start=seeded, stop=rows
+                ))
+                await conn.execute(f"VACUUM ANALYZE {SCHEMA}.{table}")
+            seeded = rows
+            for name, sql, per_account in (
+                ("account month", ACCOUNT_SQL, True),
+                ("month total", MONTH_SQL, False),
+            ):
+                accounts = rows // ROWS_PER_ACCOUNT
+                plain = await time_queries(conn, sql, "plain", per_account, accounts)
+                partitioned = await time_queries(conn, sql, "partitioned", per_account, accounts)
+                print(f"{rows:>10} {name:<14} {plain:>10.2f} {partitioned:>15.2f}")
+    finally:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())